@@ -4,3 +4,7 @@
 class BaseEmbeddingClient:
     def embed_text(self, text: str) -> list[float]:
         raise NotImplementedError()
+
+    def embed_texts(self, texts: list[str]) -> list[list[float]]:
+        # Clients whose API takes a list override this with one request
+        return [self.embed_text(text) for text in texts]
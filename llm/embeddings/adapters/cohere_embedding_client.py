@@ -27,3 +27,7 @@ class CohereEmbeddingClient(BaseEmbeddingClient):
     def embed_text(self, text: str) -> list[float]:
         resp = self.client.embed(model=self.embed_model, texts=[text])
         return resp.embeddings[0]
+
+    def embed_texts(self, texts: list[str]) -> list[list[float]]:
+        resp = self.client.embed(model=self.embed_model, texts=texts)
+        return resp.embeddings
@@ -104,3 +104,40 @@ class OllamaEmbeddingClient:
             raise RuntimeError(f"Model '{self.model_name}' returned empty embedding for text='{text[:50]}...'")
 
         return embedding
+
+    def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        """
+        Generate embedding vectors for several texts in one request.
+
+        Args:
+            texts: input texts to embed
+
+        Returns:
+            List[List[float]]: one embedding vector per text, in order
+
+        Raises:
+            RuntimeError if embedding fails or a vector is missing
+        """
+        if not texts or not all(texts):
+            raise ValueError("Cannot embed empty text")
+
+        payload = {"model": self.model_name, "input": texts}
+
+        headers = {}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+
+        try:
+            resp = httpx.post(self.endpoint, json=payload, headers=headers, timeout=30.0)
+            resp.raise_for_status()
+        except httpx.RequestError as e:
+            raise RuntimeError(f"Embedding request failed for {len(texts)} texts: {e}")
+        except httpx.HTTPStatusError as e:
+            raise RuntimeError(f"Embedding request returned HTTP {e.response.status_code} for {len(texts)} texts")
+
+        embeddings = resp.json().get("embeddings", [])
+
+        if len(embeddings) != len(texts) or not all(embeddings):
+            raise RuntimeError(f"Model '{self.model_name}' returned {len(embeddings)} embeddings for {len(texts)} texts")
+
+        return embeddings
@@ -31,3 +31,12 @@ class OpenAIEmbeddingClient(BaseEmbeddingClient):
             model=self.embed_model
         )
         return resp.data[0].embedding
+
+    def embed_texts(self, texts: list[str]) -> list[list[float]]:
+        import openai
+        resp = openai.Embedding.create(
+            input=texts,
+            model=self.embed_model
+        )
+        # One vector per input, tagged with its position
+        return [d.embedding for d in sorted(resp.data, key=lambda d: d.index)]
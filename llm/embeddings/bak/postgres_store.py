@@ -1,8 +1,8 @@
 # runtime/embedding/postgres_store.py
-from typing import List, Dict, Any
+import asyncio
+import json
+from typing import ClassVar, List, Dict, Any, Sequence
 import asyncpg
-import psycopg2
-import psycopg2.extras
 import numpy as np
 from llm.embeddings.base import EmbeddingStore
 from runtime.logger import AgentLogger
@@ -14,19 +14,30 @@ class PostgresEmbeddingStore(EmbeddingStore):
     """
     logger = None
 
+    # One pool per DSN, shared by every store instance in the process
+    _pools: ClassVar[Dict[str, asyncpg.pool.Pool]] = {}
+    _pool_lock: ClassVar[asyncio.Lock] = asyncio.Lock()
+
     def __init__(self, config: Dict[str, Any]):
         self.dsn= config.get("dsn") # Data Source Name
         self.collections = config.get("collections")
-        self.pool: asyncpg.pool.Pool | None = None
+        self.dims = config.get("dims", 768)
+        self.hnsw_ef_search = config.get("hnsw_ef_search", 64)
 
-        # Initialize connections and ensure tables exist
-        #self.conn = psycopg2.connect(dsn)
-        #self.conn.autocommit = True
+        # Connection pool tuning
+        self.pool_min = config.get("pool_min", 10)
+        self.pool_max = config.get("pool_max", 50)
+        self.command_timeout = config.get("command_timeout", 60)
+        self.max_queries = config.get("max_queries", 50_000)
+        self.max_inactive_connection_lifetime = config.get("max_inactive_connection_lifetime", 300)
+        self.statement_cache_size = config.get("statement_cache_size", 1024)
+        self.pool: asyncpg.pool.Pool | None = None
 
         # Bind workspace logger ONCE
         if PostgresEmbeddingStore.logger is None:
-            PostgresEmbeddingStore.logger = AgentLogger.get_logger(None, component="postgres_embedding")
+            PostgresEmbeddingStore.logger = AgentLogger.get_logger(component="module", module="postgres_embedding")
 
+        global logger
         logger = PostgresEmbeddingStore.logger
 
         self.connect(dsn=self.dsn)  
@@ -36,13 +47,53 @@ class PostgresEmbeddingStore(EmbeddingStore):
 
 
 
-    async def connect(self, dsn: str):
+    async def connect(self, dsn: str | None = None):
             """
-            Establish async connection pool.
+            Establish async connection pool, reusing the shared pool for this DSN.
+            """
+            if self.pool is not None:
+                return
+
+            dsn = dsn or self.dsn
+            cls = type(self)
+            async with cls._pool_lock:
+                pool = cls._pools.get(dsn)
+                if pool is None:
+                    pool = await asyncpg.create_pool(
+                        dsn=dsn,
+                        min_size=self.pool_min,
+                        max_size=self.pool_max,
+                        command_timeout=self.command_timeout,
+                        max_queries=self.max_queries,
+                        max_inactive_connection_lifetime=self.max_inactive_connection_lifetime,
+                        statement_cache_size=self.statement_cache_size,
+                    )
+                    cls._pools[dsn] = pool
+                    logger.info("Postgres connection pool initialized")
+            self.pool = pool
+
+    @classmethod
+    async def close_all(cls) -> None:
+            """
+            Close every shared pool. Call once on shutdown.
+            """
+            async with cls._pool_lock:
+                pools = list(cls._pools.values())
+                cls._pools.clear()
+            await asyncio.gather(*(pool.close() for pool in pools))
+
+    def get_stats(self) -> Dict[str, int]:
+            """
+            Current pool occupancy.
             """
             if self.pool is None:
-                self.pool = await asyncpg.create_pool(dsn=dsn)
-                logger.info("Postgres connection pool initialized")
+                return {"size": 0, "idle": 0, "min_size": self.pool_min, "max_size": self.pool_max}
+            return {
+                "size": self.pool.get_size(),
+                "idle": self.pool.get_idle_size(),
+                "min_size": self.pool.get_min_size(),
+                "max_size": self.pool.get_max_size(),
+            }
 
     async def initialize_tables(self):
             """
@@ -50,45 +101,154 @@ class PostgresEmbeddingStore(EmbeddingStore):
             """
             if self.pool is None:
                 raise RuntimeError("Connection pool not initialized. Call connect() first.")
-            async with self.pool.acquire() as conn:
+
+            ddl_stmts = ["CREATE EXTENSION IF NOT EXISTS vector"] + [
+                f"""
+                CREATE TABLE IF NOT EXISTS {collection} (
+                    id TEXT PRIMARY KEY,
+                    vector vector({self.dims}) NOT NULL,
+                    metadata JSONB
+                )
+                """
+                for collection in self.collections
+            ]
+            async with self.pool.acquire() as conn, conn.transaction():
+                await conn.execute(";\n".join(ddl_stmts))
+                # CREATE TABLE IF NOT EXISTS keeps tables from older versions
+                # of this store as they were
                 for collection in self.collections:
-                    await conn.execute(
-                        f"""
-                        CREATE TABLE IF NOT EXISTS {collection} (
-                            id SERIAL PRIMARY KEY,
-                            vector DOUBLE PRECISION[],
-                            metadata JSONB
-                        )
-                        """
-                    )
-                    logger.info(f"Initialized collection/table '{coll}'")
+                    await self._migrate_columns(conn, collection)
+            for collection in self.collections:
+                logger.info("Initialized collection/table '%s'", collection)
+
+            # CREATE INDEX CONCURRENTLY cannot run inside a transaction block,
+            # so each index is built on its own pooled connection in parallel.
+            await asyncio.gather(*(
+                self._create_hnsw_index(collection) for collection in self.collections
+            ))
             logger.info("Postgres tables ensured")
 
-    def add_embeddings(self, collection: str, id: str, vector: List[float], metadata: Dict[str, Any]):
+    async def _migrate_columns(self, conn, collection: str):
+            """
+            Bring a table created with a SERIAL id or a REAL[] / DOUBLE
+            PRECISION[] vector column to TEXT ids and vector(dims), which the
+            HNSW index and the ::vector upsert need.
+            """
+            rows = await conn.fetch(
+                """
+                SELECT attname, format_type(atttypid, atttypmod)
+                FROM pg_attribute
+                WHERE attrelid = $1::regclass
+                  AND attname IN ('id', 'vector')
+                  AND NOT attisdropped
+                """,
+                collection,
+            )
+            types = {name: type_ for name, type_ in rows}
+
+            wanted = f"vector({self.dims})"
+            current = types.get("vector")
+            if current is not None and current.endswith("[]"):
+                logger.info("Migrating %s.vector from %s to %s", collection, current, wanted)
+                await conn.execute(
+                    f"ALTER TABLE {collection} ALTER COLUMN vector TYPE {wanted} USING vector::{wanted}"
+                )
+            elif current != wanted:
+                raise RuntimeError(
+                    f"Collection '{collection}' has a vector column of type {current}, "
+                    f"expected {wanted}; migrate or drop the table"
+                )
+
+            if types.get("id") != "text":
+                logger.info("Migrating %s.id from %s to text", collection, types.get("id"))
+                await conn.execute(
+                    f"ALTER TABLE {collection} ALTER COLUMN id DROP DEFAULT, ALTER COLUMN id TYPE TEXT"
+                )
+
+    async def _create_hnsw_index(self, collection: str):
+            # ANN index for the <#> (negative inner product) operator
+            async with self.pool.acquire() as conn:
+                await conn.execute(
+                    f"""
+                    CREATE INDEX CONCURRENTLY IF NOT EXISTS {collection}_vector_hnsw
+                    ON {collection} USING hnsw (vector vector_ip_ops)
+                    """
+                )
+
+    async def add_embeddings(
+        self,
+        collection: str,
+        ids: Sequence[str],
+        vectors: Sequence[Sequence[float]],
+        metadatas: Sequence[Dict[str, Any]],
+    ):
+        """
+        Upsert a batch of embeddings with a single COPY.
+
+        Rows are copied into a transaction-scoped staging table and merged
+        into the collection in one statement, so existing ids are updated.
+        """
         if collection not in self.collections:
             raise ValueError(f"Unknown collection '{collection}'")
-        with self.conn.cursor() as cur:
-            cur.execute(
-                f"INSERT INTO {collection} (id, vector, metadata) VALUES (%s, %s, %s) ON CONFLICT (id) DO UPDATE SET vector = EXCLUDED.vector, metadata = EXCLUDED.metadata",
-                (id, vector, psycopg2.extras.Json(metadata))
-            )
-        logger.debug(f"Inserted embedding {id} into collection {collection}")
+        if not (len(ids) == len(vectors) == len(metadatas)):
+            raise ValueError("ids, vectors and metadatas must have the same length")
+
+        records = [
+            (id, list(vector), json.dumps(metadata))
+            for id, vector, metadata in zip(ids, vectors, metadatas)
+        ]
+        staging = f"{collection}_staging"
+
+        async with self.pool.acquire() as conn:
+            async with conn.transaction():
+                # Staged as REAL[] since asyncpg has no binary codec for vector
+                await conn.execute(
+                    f"""
+                    CREATE TEMP TABLE {staging} (
+                        id TEXT, vector REAL[], metadata JSONB
+                    ) ON COMMIT DROP
+                    """
+                )
+                await conn.copy_records_to_table(
+                    staging,
+                    records=records,
+                    columns=["id", "vector", "metadata"],
+                )
+                await conn.execute(
+                    f"""
+                    INSERT INTO {collection} (id, vector, metadata)
+                    SELECT id, vector::vector, metadata FROM {staging}
+                    ON CONFLICT (id) DO UPDATE
+                    SET vector = EXCLUDED.vector, metadata = EXCLUDED.metadata
+                    """
+                )
+        logger.debug("Inserted %d embeddings into collection %s", len(records), collection)
 
-    def query_embeddings(self, collection: str, query_vector: List[float], top_k: int = 5) -> List[Dict[str, Any]]:
+    async def query_embeddings(self, collection: str, query_vector: List[float], top_k: int = 5) -> List[Dict[str, Any]]:
         if collection not in self.collections:
             raise ValueError(f"Unknown collection '{collection}'")
-        with self.conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
-            cur.execute(
-                f"""
-                SELECT id, metadata, vector <#> %s AS distance
-                FROM {collection}
-                ORDER BY vector <#> %s
-                LIMIT %s;
-                """,
-                (query_vector, query_vector, top_k)
-            )
-            results = cur.fetchall()
-        return results
+        async with self.pool.acquire() as conn:
+            # SET LOCAL only lasts for the enclosing transaction
+            async with conn.transaction():
+                await conn.execute(f"SET LOCAL hnsw.ef_search = {int(self.hnsw_ef_search)}")
+                rows = await conn.fetch(
+                    f"""
+                    SELECT id, metadata, vector <#> $1::real[]::vector AS distance
+                    FROM {collection}
+                    ORDER BY distance
+                    LIMIT $2
+                    """,
+                    query_vector,
+                    top_k,
+                )
+        return [
+            {
+                "id": row["id"],
+                "metadata": json.loads(row["metadata"]) if row["metadata"] is not None else None,
+                "distance": row["distance"],
+            }
+            for row in rows
+        ]
 
     async def delete_embeddings(self, filters: Dict[str, Any]) -> None:
         await self.connect()
@@ -59,12 +59,3 @@ class EpisodicMemory(BaseModel):
     documents: Optional[Sequence[str]]               # Any document
     metadatas: Optional[Sequence[Dict[str, Any]]]    # Any Metadata
     annotations: Optional[Dict[str, Any]] = None     # optional field for metadata or annotations
-
-
-# Required in Pydantic v2
-ProposalMemory.model_rebuild()
-CritiqueMemory.model_rebuild()
-SynthesizerMemory.model_rebuild()
-SemanticMemory.model_rebuild()
-EpisodicMemory.model_rebuild()
-
@@ -1,10 +1,28 @@
 # runtime/memory_adapters/base.py
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, Sequence
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Sequence
 from pydantic import BaseModel
 
 
+@lru_cache(maxsize=256)
+def _cached_namespace_keys(key_namespace: tuple) -> Mapping[str, Any]:
+    return MappingProxyType(dict(key_namespace))
+
+
+def namespace_keys(key_namespace) -> Mapping[str, Any]:
+    """
+    Read-only mapping view of a key_namespace of (name, value) pairs.
+    Converted once per distinct namespace; unhashable ones are not cached.
+    """
+    try:
+        return _cached_namespace_keys(key_namespace)
+    except TypeError:
+        return dict(key_namespace)
+
+
 class MemoryAdapter(ABC):
     """
     Base interface for memory adapters.
@@ -20,6 +38,10 @@ class MemoryAdapter(ABC):
       - Or both
     """
 
+    # True when fetch_memory applies `filters` inside the backend query.
+    # MemoryManager over-fetches and post-filters for adapters that don't.
+    supports_filter_pushdown: bool = False
+
     # ============================================================
     # Episodic Memory (Persistent / CRUD)
     # ============================================================
@@ -51,6 +73,10 @@ class MemoryAdapter(ABC):
     ) -> List[Dict[str, Any]]:
         """
         Fetch episodic memory objects based on filters and/or query.
+
+        Adapters that set supports_filter_pushdown must translate `filter`
+        into the backend query (SQL WHERE, FT.SEARCH, Chroma `where=`) so
+        top_k counts matching rows only; never post-filter fetched rows.
         """
         pass
 
@@ -1,7 +1,7 @@
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
 import chromadb
-from llm.memory_adapters.base import MemoryAdapter
+from llm.old.memory_adapters_old.base import MemoryAdapter
 from llm.memory_schemas import EpisodicMemory, SemanticMemory
 
 class ChromaDBAdapter(MemoryAdapter):
@@ -2,7 +2,7 @@ from pydantic import BaseModel
 from typing import Any, Dict, List, Optional, Union
 from langmem import create_memory_manager 
 from langchain_core.runnables import Runnable
-from llm.memory_adapters.base import MemoryAdapter
+from llm.old.memory_adapters_old.base import MemoryAdapter
 from llm.memory_schemas import EpisodicMemory, SemanticMemory
 
 #from llm.llm_manager import LLMManager
@@ -19,22 +19,15 @@ class LangMemSemanticAdapter(MemoryAdapter):
         )
 
 
-    def _key(self, session_id: str, namespace: str, uid: str):
-        return f"{session_id}:{self.namespace}:{uid}"
-
     async def store_memory(
         self,
         memory: Union[Dict, BaseModel, EpisodicMemory]
         # namespace: Optional[str] = None
     ) -> str:
         """
-        Stores a memory object in Redis. Returns the generated key.
+        Stores a memory object in LangMem. Returns the key LangMem assigned.
         """
-        key = str(uuid4())
-        langmem_key = self._key(memory.session_id, memory.namespace, key)
-
-        await self.manager.add(memory.model_dump_json() )
-        return langmem_key
+        return await self.manager.add(memory.model_dump_json())
 
 
     async def fetch_memory(
@@ -1,9 +1,10 @@
+import copy
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-from llm.memory_adapters.base import MemoryAdapter
+from llm.old.memory_adapters_old.base import MemoryAdapter
 from llm.memory_schemas import EpisodicMemory
-from llm.memory_adapters.local_memory_store_bm25 import LocalMemoryStore
+from llm.old.memory_adapters_old.local_memory_store_bm25 import LocalMemoryStore
 
 
 class LocalMemoryAdapter(MemoryAdapter):
@@ -34,24 +35,40 @@ class LocalMemoryAdapter(MemoryAdapter):
             if self.persist_dir:
                 persist_path = self.persist_dir / f"{ns}.json"
 
-            self._stores[ns] = LocalMemoryStore(
+            store = LocalMemoryStore(
                 workspace_name=self.workspace_name,
                 persist_path=persist_path,
             )
+            # Entries reloaded from disk went through JSON; validate them
+            # once so they hold what model_dump() produced on the way in
+            for entry in store.data:
+                entry["metadata"] = self._revalidate(entry["metadata"])
+            self._stores[ns] = store
 
         return self._stores[ns]
 
-    def _memory_to_text(self, memory: EpisodicMemory) -> str:
+    @staticmethod
+    def _revalidate(metadata: Dict[str, Any]) -> Dict[str, Any]:
+        model = EpisodicMemory.model_validate(metadata)
+        if model.key_namespace is not None:
+            # JSON has no tuples: restore the (key, value) pairs, so the
+            # namespace is hashable again
+            model.key_namespace = tuple(tuple(pair) for pair in model.key_namespace)
+        return model.model_dump()
+
+    def _to_model(self, item: Dict[str, Any]) -> EpisodicMemory:
+        # Entries hold validated model_dump() output, so no re-validation;
+        # copied so callers never modify the stored entry
+        return EpisodicMemory.model_construct(**copy.deepcopy(item["metadata"]))
+
+    def _memory_to_text(self, metadata: Dict[str, Any]) -> str:
         """
-        What gets indexed by BM25.
+        What gets indexed by BM25, built from the already-dumped memory.
         Tune this freely.
         """
-        parts = [
-            memory.stage,
-            memory.task,
-            str(memory.summary),
-        ]
-        return " ".join(p for p in parts if p)
+        stage = metadata.get("stage") or ""
+        task = metadata.get("task") or ""
+        return f"{stage} {task} {metadata.get('summary')}".strip()
 
     # -----------------------------
     # MemoryAdapter API
@@ -64,9 +81,11 @@ class LocalMemoryAdapter(MemoryAdapter):
     ) -> str:
         store = self._get_store(namespace)
 
+        # One dump serves both the index text and the stored metadata
+        metadata = memory.model_dump()
         store.add(
-            text=self._memory_to_text(memory),
-            metadata=memory.dict(),
+            text=self._memory_to_text(metadata),
+            metadata=metadata,
         )
 
         return f"{namespace or 'default'}:{len(store.data) - 1}"
@@ -87,51 +106,43 @@ class LocalMemoryAdapter(MemoryAdapter):
         store = self._get_store(namespace)
 
         # -----------------------------
-        # 1. Search
-        # -----------------------------
-        if query:
-            results = await store.asearch(query=query, top_k=top_k or 5)
-        else:
-            results = store.data
-
-        # -----------------------------
-        # 2. Metadata filtering
+        # 1. Metadata filtering
         # -----------------------------
-        def matches(meta: Dict[str, Any]) -> bool:
-            if session_id and meta.get("session_id") != session_id:
-                return False
-            if agent and meta.get("agent") != agent:
-                return False
-            if stage and meta.get("stage") != stage:
-                return False
-            if task and meta.get("task") != task:
-                return False
-            if filter:
-                for k, v in filter.items():
-                    if meta.get(k) != v:
-                        return False
-            return True
-
-        filtered = [
-            r for r in results
-            if matches(r["metadata"])
+        criteria = [
+            (k, v)
+            for k, v in (
+                ("session_id", session_id),
+                ("agent", agent),
+                ("stage", stage),
+                ("task", task),
+            )
+            if v
         ]
+        if filter:
+            criteria.extend(filter.items())
+
+        idx = store.select(criteria)
 
         # -----------------------------
-        # 3. Offset + limit
+        # 2. Search (scores only the filtered rows)
         # -----------------------------
         start = offset
         end = start + (limit or top_k or 5)
 
-        sliced = filtered[start:end]
+        if query:
+            results = await store.asearch(query=query, top_k=end, candidates=idx)
+        else:
+            results = [store.data[i] for i in idx]
+
+        # -----------------------------
+        # 3. Offset + limit
+        # -----------------------------
+        sliced = results[start:end]
 
         # -----------------------------
         # 4. Return Pydantic models
         # -----------------------------
-        return [
-            EpisodicMemory(**item["metadata"])
-            for item in sliced
-        ]
+        return [self._to_model(item) for item in sliced]
 
     async def asearch(
         self,
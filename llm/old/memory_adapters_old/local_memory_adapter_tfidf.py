@@ -2,16 +2,82 @@
 
 from __future__ import annotations
 import asyncio
+import os
+import tempfile
 from pathlib import Path
 from typing import Any, Dict, List, Optional
+import numpy as np
+import orjson
 from pydantic import BaseModel
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from runtime.memory_adapters.base import MemoryAdapter
+from scipy import sparse
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+try:
+    from numba import njit, prange
+except ImportError:  # optional, large candidate sets fall back to scipy
+    njit = None
+from llm.old.memory_adapters_old.base import MemoryAdapter
 from runtime.memory_schemas import GenericMemory
-import json
 import uuid
 
+# Hashed feature space; large enough that collisions are rare for short memories
+_N_FEATURES = 2 ** 18
+
+# The append log is folded into the snapshot once it outgrows
+# max(2 x snapshot size, this many bytes)
+_COMPACT_MIN_BYTES = 1 << 20
+
+# First line of every append log: {_LOG_HEADER: generation}. A snapshot
+# records the generation of the log it folded in, so a log left behind by
+# a crash during compaction is recognized and not replayed twice
+_LOG_HEADER = "_log_generation"
+
+# Metadata fields indexed as {value: [positions]} for filtering and clear()
+_INDEXED_FIELDS = ("session_id", "agent", "stage", "task")
+
+# HashingVectorizer holds no fitted state, so one instance serves every
+# adapter and namespace in the process
+_SHARED_VECTORIZER = HashingVectorizer(
+    n_features=_N_FEATURES, alternate_sign=False, norm=None, dtype=np.float32
+)
+
+
+def _top_k_indices(scores: np.ndarray, top_k: Optional[int]) -> np.ndarray:
+    """
+    Indices of the top_k highest scores, best first.
+    Partitions in O(n) and sorts only the k survivors.
+    """
+    k = scores.size if top_k is None else min(top_k, scores.size)
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    idx = np.argpartition(-scores, k - 1)[:k]
+    return idx[np.argsort(-scores[idx])]
+
+# Candidate sets at least this large are scored by the Numba kernel
+_JIT_MIN_ROWS = 256
+
+
+if njit is not None:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _csr_dot_rows(data, indices, indptr, rows, q_indices, q_data):
+        """
+        Dot product of the query against the given CSR rows, without
+        slicing the matrix. q_indices must be sorted.
+        """
+        scores = np.zeros(rows.shape[0], dtype=np.float32)
+        for r in prange(rows.shape[0]):
+            row = rows[r]
+            acc = np.float32(0.0)
+            for p in range(indptr[row], indptr[row + 1]):
+                j = np.searchsorted(q_indices, indices[p])
+                if j < q_indices.shape[0] and q_indices[j] == indices[p]:
+                    acc += data[p] * q_data[j]
+            scores[r] = acc
+        return scores
+else:
+    _csr_dot_rows = None
+
+
 class LocalMemoryAdapter(MemoryAdapter):
     """
     Local in-memory memory adapter.
@@ -19,14 +85,42 @@ class LocalMemoryAdapter(MemoryAdapter):
     Persistent JSON storage optional.
     """
 
-    def __init__(self, workspace_name: str, persist_path: Optional[Path] = None):
+    def __init__(
+        self,
+        workspace_name: str,
+        persist_path: Optional[Path] = None,
+        vectorizer: Optional[HashingVectorizer] = None,
+    ):
         self.workspace_name = workspace_name
         self.persist_path = persist_path
         self._memory: List[Dict[str, Any]] = []
-        self._vectorizer = TfidfVectorizer()
-        self._embeddings = None
+        # Stateless, so adding a memory never refits the vocabulary.
+        # A custom vectorizer must keep n_features == _N_FEATURES.
+        self._vectorizer = vectorizer or _SHARED_VECTORIZER
+        # Raw term counts, one row per entry in self._memory. IDF weighting
+        # and L2 normalization are applied at query time.
+        self._embeddings: Optional[sparse.csr_matrix] = None
+        # Number of rows each hashed feature appears in
+        self._df = np.zeros(_N_FEATURES, dtype=np.int32)
+        self._idf: Optional[np.ndarray] = None
+        # Unit-length TF-IDF rows, rebuilt lazily once inserts change the IDF
+        self._embeddings_norm: Optional[sparse.csr_matrix] = None
 
-        if persist_path and persist_path.exists():
+        # {field: {value: [positions]}}, positions in insertion order
+        self._index: Dict[str, Dict[Any, List[int]]] = {f: {} for f in _INDEXED_FIELDS}
+        # Positions removed by clear(session_id); compacted away in bulk
+        self._deleted: set = set()
+
+        # Inserts are appended here and folded into persist_path periodically
+        self._log_path = persist_path.with_suffix(".jsonl") if persist_path else None
+        # Generation of the append log; bumped by every snapshot
+        self._log_generation = 0
+        # Count matrix for the snapshot, so loading doesn't re-hash every text
+        self._counts_path = (
+            persist_path.with_suffix(".embeddings.npz") if persist_path else None
+        )
+
+        if persist_path and (persist_path.exists() or self._log_path.exists()):
             self._load_from_disk()
 
     # -----------------------------------------------------------------
@@ -38,12 +132,13 @@ class LocalMemoryAdapter(MemoryAdapter):
         memory: BaseModel,
         namespace: Optional[str] = None
     ) -> str:
-        mem_dict = memory.dict()
+        mem_dict = memory.model_dump()
         mem_dict["_id"] = str(uuid.uuid4())
         self._memory.append(mem_dict)
-        self._update_embeddings()
+        self._index_memory(len(self._memory) - 1, mem_dict)
+        self._append_embedding(mem_dict.get("text", ""))
         if self.persist_path:
-            self._save_to_disk()
+            self._append_to_disk(mem_dict)
         return mem_dict["_id"]
 
     async def fetch_memory(
@@ -60,35 +155,67 @@ class LocalMemoryAdapter(MemoryAdapter):
     ) -> List[Dict[str, Any]]:
         """
         Fetch memory objects filtered by session, agent, stage, task, or additional filters.
-        If 'filters' contains a 'query' key, performs TF-IDF similarity search.
+        If 'query' (or a 'query' key in 'filter') is given, performs TF-IDF similarity search.
         """
-        results = self._memory
+        # Positions into self._memory, which are also rows of the cached
+        # TF-IDF matrix
+        positions = range(len(self._memory))
+        memory = self._memory
 
-        # Apply standard filters
-        if session_id:
-            results = [m for m in results if m.get("session_id") == session_id]
-        if agent:
-            results = [m for m in results if m.get("agent") == agent]
-        if stage:
-            results = [m for m in results if m.get("stage") == stage]
-        if task:
-            results = [m for m in results if m.get("task") == task]
-        if filter:
-            for k, v in filter.items():
-                if k != "query":
-                    results = [m for m in results if m.get(k) == v]
+        # Remaining filter keys; "query" is not a metadata field
+        extra = [(k, v) for k, v in filter.items() if k != "query"] if filter else []
+
+        # Apply standard filters: intersect index buckets, smallest first.
+        # Indexed fields given through 'filter' use the buckets too.
+        criteria = [
+            (f, v)
+            for f, v in zip(_INDEXED_FIELDS, (session_id, agent, stage, task))
+            if v
+        ]
+        criteria += [(k, v) for k, v in extra if k in self._index and v is not None]
+        extra = [(k, v) for k, v in extra if k not in self._index or v is None]
+        if criteria:
+            buckets = sorted(
+                (self._index[f].get(v, []) for f, v in criteria), key=len
+            )
+            positions = buckets[0]
+            for bucket in buckets[1:]:
+                members = set(bucket)
+                positions = [i for i in positions if i in members]
+
+        # Tombstones and any remaining filters in a single pass
+        if self._deleted or extra:
+            deleted = self._deleted
+            positions = [
+                i for i in positions
+                if i not in deleted
+                and all(memory[i].get(k) == v for k, v in extra)
+            ]
 
         # Semantic-ish search using TF-IDF
-        query_text = filter.get("query") if filter else None
-        if query_text and results:
-            corpus = [m["text"] for m in results if "text" in m]
-            if corpus:
-                vecs = self._vectorizer.fit_transform(corpus)
-                query_vec = self._vectorizer.transform([query_text])
-                sims = cosine_similarity(query_vec, vecs).flatten()
-                top_indices = sims.argsort()[::-1][:top_k]
-                results = [results[i] for i in top_indices if sims[i] > 0]
+        query_text = query or (filter.get("query") if filter else None)
+        if query_text and positions:
+            vecs = self._normalized()
+            # Only the query is transformed here; _update_embeddings and
+            # _append_embedding are the only places rows are built
+            query_vec = self._query_vector(query_text)
+            # Rows and query are unit length, so cosine similarity is
+            # a sparse inner product
+            if _csr_dot_rows is not None and len(positions) >= _JIT_MIN_ROWS:
+                query_vec.sort_indices()
+                sims = _csr_dot_rows(
+                    vecs.data, vecs.indices, vecs.indptr,
+                    np.asarray(positions, dtype=np.int64),
+                    query_vec.indices, query_vec.data,
+                )
+            else:
+                if not isinstance(positions, range):
+                    vecs = vecs[np.asarray(positions)]
+                sims = (vecs @ query_vec.T).toarray().ravel()
+            top_indices = _top_k_indices(sims, top_k)
+            positions = [positions[i] for i in top_indices if sims[i] > 0]
 
+        results = [memory[i] for i in positions]
         return results[:top_k] if top_k else results
 
     async def asearch(
@@ -113,10 +240,10 @@ class LocalMemoryAdapter(MemoryAdapter):
 
     async def clear(self, session_id: Optional[str] = None):
         if session_id:
-            self._memory = [m for m in self._memory if m.get("session_id") != session_id]
+            self._tombstone(self._index["session_id"].pop(session_id, []))
         else:
             self._memory = []
-        self._update_embeddings()
+            self._update_embeddings()
         if self.persist_path:
             self._save_to_disk()
 
@@ -124,20 +251,218 @@ class LocalMemoryAdapter(MemoryAdapter):
     # Internal helpers
     # -----------------------------------------------------------------
 
-    def _update_embeddings(self):
-        corpus = [m["text"] for m in self._memory if "text" in m]
-        if corpus:
-            self._embeddings = self._vectorizer.fit_transform(corpus)
-        else:
+    def _index_memory(self, position: int, mem_dict: Dict[str, Any]):
+        for field in _INDEXED_FIELDS:
+            value = mem_dict.get(field)
+            if value is not None:
+                self._index[field].setdefault(value, []).append(position)
+
+    def _tombstone(self, positions: List[int]):
+        """
+        Hide positions from fetches and drop them from the IDF statistics.
+        Rows are physically removed once tombstones outnumber live rows.
+        """
+        if not positions:
+            return
+        self._deleted.update(positions)
+        features, counts = np.unique(
+            self._embeddings[np.asarray(positions)].indices, return_counts=True
+        )
+        self._df[features] -= counts.astype(np.int32)
+        self._idf = None
+        self._embeddings_norm = None
+
+        if len(self._deleted) * 2 > len(self._memory):
+            self._memory = self._live_memory()
+            self._update_embeddings()
+
+    def _live_memory(self) -> List[Dict[str, Any]]:
+        if not self._deleted:
+            return self._memory
+        return [m for i, m in enumerate(self._memory) if i not in self._deleted]
+
+    def _update_embeddings(self, counts: Optional[sparse.csr_matrix] = None):
+        """
+        Rebuild counts, document frequencies and metadata index from scratch.
+        Only needed after bulk changes (load, clear, compaction). counts,
+        when given, are precomputed rows for self._memory.
+        """
+        self._deleted = set()
+        self._index = {f: {} for f in _INDEXED_FIELDS}
+        for position, mem_dict in enumerate(self._memory):
+            self._index_memory(position, mem_dict)
+
+        self._df[:] = 0
+        self._idf = None
+        self._embeddings_norm = None
+        if not self._memory:
             self._embeddings = None
+            return
+        if counts is None:
+            counts = self._vectorizer.transform(
+                [m.get("text", "") for m in self._memory]
+            )
+        self._embeddings = counts.tocsr()
+        features, df = np.unique(self._embeddings.indices, return_counts=True)
+        self._df[features] = df
+
+    def _append_embedding(self, text: str):
+        """
+        Add one row of counts; cost depends only on the new document.
+        """
+        row = self._vectorizer.transform([text]).tocsr()
+        # Each feature appears once per row in CSR, so this counts documents
+        self._df[row.indices] += 1
+        self._idf = None
+        self._embeddings_norm = None
+        if self._embeddings is None:
+            self._embeddings = row
+        else:
+            self._embeddings = sparse.vstack([self._embeddings, row], format="csr")
+
+    def _current_idf(self) -> np.ndarray:
+        if self._idf is None:
+            n = len(self._memory) - len(self._deleted)
+            self._idf = (np.log((1 + n) / (1 + self._df)) + 1).astype(np.float32)
+        return self._idf
+
+    def _tfidf(self, counts: sparse.csr_matrix) -> sparse.csr_matrix:
+        """
+        Weight raw counts by smoothed IDF and L2-normalize each row.
+        """
+        weighted = counts.astype(np.float32, copy=True).tocsr()
+        # Scale .data directly rather than multiplying by a sparse diagonal
+        weighted.data *= self._current_idf()[weighted.indices]
+        return normalize(weighted, copy=False)
+
+    def _normalized(self) -> Optional[sparse.csr_matrix]:
+        """
+        Unit-length TF-IDF matrix for all stored rows, reused across
+        queries until the next insert.
+        """
+        if self._embeddings_norm is None and self._embeddings is not None:
+            self._embeddings_norm = self._tfidf(self._embeddings)
+        return self._embeddings_norm
+
+    def _query_vector(self, text: str) -> sparse.csr_matrix:
+        q = self._vectorizer.transform([text]).astype(np.float32).tocsr()
+        q.data *= self._current_idf()[q.indices]
+        norm = np.sqrt(np.vdot(q.data, q.data))
+        if norm:
+            q.data /= norm
+        return q
 
     def _save_to_disk(self):
+        """
+        Write a full snapshot atomically and reset the append log.
+        """
         self.persist_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.persist_path, "w", encoding="utf-8") as f:
-            json.dump(self._memory, f, indent=2)
+        snapshot = {"log_generation": self._log_generation, "memory": self._live_memory()}
+        fd, tmp = tempfile.mkstemp(dir=self.persist_path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(orjson.dumps(snapshot))
+            os.replace(tmp, self.persist_path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        # The snapshot covers this log now; if we crash before the unlink,
+        # _load_from_disk skips it by its generation
+        self._log_generation += 1
+        self._log_path.unlink(missing_ok=True)
+        self._save_counts()
+
+    def _save_counts(self):
+        """
+        Write the live count rows next to the snapshot. Written after the
+        snapshot, so a sidecar older than its snapshot is never trusted.
+        """
+        if self._embeddings is None:
+            self._counts_path.unlink(missing_ok=True)
+            return
+        counts = self._embeddings
+        if self._deleted:
+            live = [i for i in range(counts.shape[0]) if i not in self._deleted]
+            counts = counts[np.asarray(live, dtype=np.intp)]
+        fd, tmp = tempfile.mkstemp(dir=self.persist_path.parent, suffix=".npz")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                sparse.save_npz(f, counts)
+            os.replace(tmp, self._counts_path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def _load_counts(self, rows: int) -> Optional[sparse.csr_matrix]:
+        """
+        Saved count matrix for a snapshot of the given length, or None if
+        it is missing or stale.
+        """
+        path = self._counts_path
+        if not path.exists() or not self.persist_path.exists():
+            return None
+        if path.stat().st_mtime_ns < self.persist_path.stat().st_mtime_ns:
+            return None
+        try:
+            counts = sparse.load_npz(path).tocsr()
+        except (OSError, ValueError):
+            return None
+        if counts.shape != (rows, _N_FEATURES):
+            return None
+        return counts
+
+    def _append_to_disk(self, mem_dict: Dict[str, Any]):
+        """
+        Append one record to the log; compact once the log gets large.
+        """
+        self._log_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self._log_path, "ab") as f:
+            if f.tell() == 0:
+                f.write(orjson.dumps({_LOG_HEADER: self._log_generation}) + b"\n")
+            f.write(orjson.dumps(mem_dict) + b"\n")
+            log_size = f.tell()
+
+        snapshot_size = self.persist_path.stat().st_size if self.persist_path.exists() else 0
+        if log_size > max(2 * snapshot_size, _COMPACT_MIN_BYTES):
+            self._save_to_disk()
 
     def _load_from_disk(self):
-        with open(self.persist_path, "r", encoding="utf-8") as f:
-            self._memory = json.load(f)
-        self._update_embeddings()
+        self._memory = []
+        # Generation of the newest log the snapshot already contains
+        covered = -1
+        if self.persist_path.exists():
+            with open(self.persist_path, "rb") as f:
+                snapshot = orjson.loads(f.read())
+            if isinstance(snapshot, list):
+                # Written before snapshots recorded a log generation
+                self._memory = snapshot
+            else:
+                self._memory = snapshot["memory"]
+                covered = snapshot["log_generation"]
+        snapshot_rows = len(self._memory)
+        self._log_generation = covered + 1
+
+        # Replay inserts made since the last snapshot
+        if self._log_path.exists():
+            with open(self._log_path, "rb") as f:
+                records = [orjson.loads(line) for line in f if line.strip()]
+            # Logs written before the header existed are generation 0
+            generation = 0
+            if records and _LOG_HEADER in records[0]:
+                generation = records.pop(0)[_LOG_HEADER]
+            if generation <= covered:
+                # Left behind by a crash between snapshot and unlink
+                self._log_path.unlink()
+            else:
+                self._memory.extend(records)
+                self._log_generation = generation
+
+        counts = self._load_counts(snapshot_rows) if snapshot_rows else None
+        if counts is not None and len(self._memory) > snapshot_rows:
+            # Only the replayed tail needs hashing
+            tail = self._vectorizer.transform(
+                [m.get("text", "") for m in self._memory[snapshot_rows:]]
+            )
+            counts = sparse.vstack([counts, tail], format="csr")
+        self._update_embeddings(counts)
 
@@ -1,9 +1,16 @@
 from pathlib import Path
-import json
-from typing import List, Dict, Any, Optional
+import orjson
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 
+import numpy as np
 from rank_bm25 import BM25Okapi
 
+# Metadata fields mirrored into columns so filters are vectorized compares
+_COLUMNS = ("session_id", "agent", "stage", "task")
+
+# Rows preallocated per column; doubled when full
+_INITIAL_CAPACITY = 64
+
 
 class LocalMemoryStore:
     """
@@ -27,6 +34,10 @@ class LocalMemoryStore:
         self._bm25: Optional[BM25Okapi] = None
         self._corpus_tokens: List[List[str]] = []
 
+        # {field: object array}; the first len(self.data) slots are live
+        self._columns: Dict[str, np.ndarray] = {}
+        self._reset_columns()
+
         if persist_path and persist_path.exists():
             self.load()
 
@@ -40,6 +51,7 @@ class LocalMemoryStore:
             "metadata": metadata or {},
         }
         self.data.append(entry)
+        self._append_columns(entry["metadata"])
 
         tokens = self.tokenizer(text.lower())
         self._corpus_tokens.append(tokens)
@@ -55,23 +67,74 @@ class LocalMemoryStore:
         else:
             self._bm25 = None
 
+    def _reset_columns(self, capacity: int = _INITIAL_CAPACITY):
+        self._columns = {
+            name: np.empty(capacity, dtype=object) for name in _COLUMNS
+        }
+
+    def _append_columns(self, metadata: Dict[str, Any]):
+        row = len(self.data) - 1
+        capacity = self._columns[_COLUMNS[0]].shape[0]
+        if row >= capacity:
+            for name, col in self._columns.items():
+                grown = np.empty(capacity * 2, dtype=object)
+                grown[:row] = col[:row]
+                self._columns[name] = grown
+        for name in _COLUMNS:
+            self._columns[name][row] = metadata.get(name)
+
     def save(self):
         if not self.persist_path:
             return
 
         self.persist_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.persist_path, "w", encoding="utf-8") as f:
-            json.dump(self.data, f, indent=2)
+        with open(self.persist_path, "wb") as f:
+            f.write(orjson.dumps(self.data))
 
     def load(self):
-        with open(self.persist_path, "r", encoding="utf-8") as f:
-            self.data = json.load(f)
+        with open(self.persist_path, "rb") as f:
+            self.data = orjson.loads(f.read())
+
+        self._reset_columns(max(_INITIAL_CAPACITY, len(self.data)))
+        for row, entry in enumerate(self.data):
+            for name in _COLUMNS:
+                self._columns[name][row] = entry["metadata"].get(name)
 
         self._corpus_tokens = [
             self.tokenizer(entry["text"].lower()) for entry in self.data
         ]
         self._rebuild_index()
 
+    # -----------------------------
+    # Filtering
+    # -----------------------------
+
+    def select(self, criteria: Sequence[Tuple[str, Any]]) -> np.ndarray:
+        """
+        Row indices whose metadata matches every (field, value) pair.
+        Column fields are matched with vectorized compares; anything
+        else falls back to a per-row check on the survivors.
+        """
+        n = len(self.data)
+        mask = np.ones(n, dtype=bool)
+        others = []
+        for name, value in criteria:
+            if name in self._columns:
+                mask &= self._columns[name][:n] == value
+            else:
+                others.append((name, value))
+
+        idx = np.flatnonzero(mask)
+        if others:
+            idx = np.array(
+                [
+                    i for i in idx
+                    if all(self.data[i]["metadata"].get(k) == v for k, v in others)
+                ],
+                dtype=np.intp,
+            )
+        return idx
+
     # -----------------------------
     # Search
     # -----------------------------
@@ -81,32 +144,43 @@ class LocalMemoryStore:
         query: str,
         top_k: int = 5,
         min_score: float = 0.0,
+        candidates: Optional[np.ndarray] = None,
     ) -> List[Dict[str, Any]]:
+        """
+        BM25 search over all rows, or only over candidates (row indices)
+        when given.
+        """
         if not self._bm25 or not self.data:
             return []
 
         query_tokens = self.tokenizer(query.lower())
-        scores = self._bm25.get_scores(query_tokens)
-
-        ranked = sorted(
-            enumerate(scores),
-            key=lambda x: x[1],
-            reverse=True,
-        )
-
-        results = []
-        for idx, score in ranked[:top_k]:
-            if score > min_score:
-                results.append(self.data[idx])
-
-        return results
+        if candidates is None:
+            candidates = np.arange(len(self.data))
+            scores = np.asarray(self._bm25.get_scores(query_tokens))
+        else:
+            if len(candidates) == 0:
+                return []
+            scores = np.asarray(
+                self._bm25.get_batch_scores(query_tokens, candidates.tolist())
+            )
+
+        ranked = np.argsort(-scores, kind="stable")[:top_k]
+
+        return [
+            self.data[candidates[i]]
+            for i in ranked
+            if scores[i] > min_score
+        ]
 
     async def asearch(
         self,
         query: str,
         top_k: int = 5,
         min_score: float = 0.0,
+        candidates: Optional[np.ndarray] = None,
     ) -> List[Dict[str, Any]]:
         # Async wrapper for LangMem compatibility
-        return self.search(query=query, top_k=top_k, min_score=min_score)
+        return self.search(
+            query=query, top_k=top_k, min_score=min_score, candidates=candidates
+        )
 
@@ -1,7 +1,28 @@
 from pathlib import Path
-import json
+import orjson
+import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+
+
+def _cosine(query_vec, embeddings):
+    """
+    Cosine similarity of one TF-IDF row against every stored row.
+    TfidfVectorizer L2-normalizes its output, so this is a sparse dot product.
+    """
+    return (embeddings @ query_vec.T).toarray().ravel()
+
+
+def _top_k_indices(scores, top_k: int):
+    """
+    Indices of the top_k highest scores, best first.
+    Partitions in O(n) and sorts only the k survivors.
+    """
+    k = min(top_k, scores.size)
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    idx = np.argpartition(-scores, k - 1)[:k]
+    return idx[np.argsort(-scores[idx])]
+
 
 class LocalMemoryStore:
     """
@@ -13,7 +34,7 @@ class LocalMemoryStore:
         self.workspace_name = workspace_name
         self.persist_path = persist_path
         self.data = []  # List of {"text": str, "metadata": dict}
-        self.vectorizer = TfidfVectorizer()
+        self.vectorizer = TfidfVectorizer(dtype=np.float32)
         self.embeddings = None
 
         if persist_path and persist_path.exists():
@@ -40,12 +61,12 @@ class LocalMemoryStore:
         if not self.persist_path:
             return
         self.persist_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.persist_path, "w", encoding="utf-8") as f:
-            json.dump(self.data, f, indent=2)
+        with open(self.persist_path, "wb") as f:
+            f.write(orjson.dumps(self.data))
 
     def load(self):
-        with open(self.persist_path, "r", encoding="utf-8") as f:
-            self.data = json.load(f)
+        with open(self.persist_path, "rb") as f:
+            self.data = orjson.loads(f.read())
         self._update_embeddings()
 
     # -----------------------------
@@ -53,22 +74,15 @@ class LocalMemoryStore:
     # -----------------------------
 
     def search(self, query: str, top_k: int = 5):
-        if not self.embeddings or not self.data:
+        if self.embeddings is None or not self.data:
             return []
 
         query_vec = self.vectorizer.transform([query])
-        sims = cosine_similarity(query_vec, self.embeddings).flatten()
-        top_indices = sims.argsort()[::-1][:top_k]
+        sims = _cosine(query_vec, self.embeddings)
+        top_indices = _top_k_indices(sims, top_k)
 
         return [self.data[i] for i in top_indices if sims[i] > 0]
 
     async def asearch(self, query: str, top_k: int = 5):
-        if not self.embeddings or not self.data:
-            return []
-
-        query_vec = self.vectorizer.transform([query])
-        sims = cosine_similarity(query_vec, self.embeddings).flatten()
-        top_indices = sims.argsort()[::-1][:top_k]
-
-        return [self.data[i] for i in top_indices if sims[i] > 0]
+        return self.search(query, top_k=top_k)
 
@@ -7,17 +7,61 @@ storing and retrieving episodic and semantic memory.
 
 MemoryContext contains NO storage logic.
 All persistence, adapters, and backends are delegated to MemoryManager.
+
+Embeddings passed through add_embeddings/queue_embeddings are forwarded
+as L2-normalized float32, so inner product equals cosine similarity.
 """
 
-from typing import Optional, Dict, Any, List
+import asyncio
+import time
+import numpy as np
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Dict, List, Set, Tuple
 from pydantic import BaseModel
 # from llm.memory_manager import MemoryManager
 
+# Queued embeddings are flushed after this long, or once max_batch are pending
+_FLUSH_MS = 10
+_MAX_BATCH = 64
+
+
+class _QueryCache:
+    """
+    Small LRU of query results with a per-entry TTL.
+    Shared by a MemoryContext and every context derived from it.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[List[Dict[str, Any]]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, results = entry
+        if expires < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return results
+
+    def put(self, key: Hashable, results: List[Dict[str, Any]]) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, results)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
 class MemoryContext:
     def __init__(
         self,
         *,
-        # memory_manager: MemoryManager,
+        memory_manager: Optional[Any] = None,
         namespace: Optional[str] = None,
         session_id: Optional[str] = None,
         agent: Optional[str] = None,
@@ -25,9 +69,10 @@ class MemoryContext:
         task: Optional[str] = None,
         top_k: Optional[int] = None,
         limit: Optional[int] = None,
+        query_cache: Optional[_QueryCache] = None,
     ):
 
-        # self.memory_manager = memory_manager
+        self.memory_manager = memory_manager
         self.namespace = namespace
         self.agent = agent
         self.top_k = top_k
@@ -41,23 +86,37 @@ class MemoryContext:
         # A new key_namespace will be formed as store key
         self.key_namespace = None
 
+        # Repeated queries within a session are served from here
+        self.query_cache = query_cache or _QueryCache()
+
+        # Embeddings queued by queue_embeddings(), as (scope, embedding,
+        # document, metadata); the scope is captured when queued, since
+        # session and stage change during Agent.run()
+        self._pending: List[Tuple[Tuple, Any, Any, Any]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+        # Failure of a timer-driven flush, raised by the next flush()
+        self._flush_error: Optional[BaseException] = None
+        # Strong references to sends started by a cancelled timer
+        self._senders: Set[asyncio.Task] = set()
+
     # ----------------------------
     # Episodic store memory
     # ----------------------------
 
-    '''
     async def store(self, memory):
+        # New memories can change any cached ranking
+        self.query_cache.clear()
         return await self.memory_manager.store( 
                 key_namespace=self.key_namespace,  
                 task=self.task, 
                 memory=memory 
             )
-    '''
+
     # ----------------------------
     # Episodic fetch memory
     # ----------------------------
 
-    '''
     async def fetch_memory(
         self, 
         filters: Optional[Dict[str, Any]] = None, 
@@ -70,23 +129,105 @@ class MemoryContext:
             top_k=top_k or self.top_k,
             limit=limit or self.limit
         )
-    '''
+
     # ----------------------------
     # Semantic memory
     # ----------------------------
-    '''
+
     async def add_embeddings(self, embeddings, documents=None, metadatas=None):
+        return await self._add_embeddings(self._scope(), embeddings, documents, metadatas)
+
+    async def _add_embeddings(self, scope, embeddings, documents=None, metadatas=None):
+        session_id, agent, stage, namespace = scope
+        self.query_cache.clear()
+        # float32 halves the bytes every backend scan has to read
+        embeddings = np.array(embeddings, dtype=np.float32)
+        # Unit length, so backends can rank by inner product alone
+        norms = np.sqrt((embeddings * embeddings).sum(-1, keepdims=True))
+        embeddings /= np.maximum(norms, 1e-12)
         return await self.memory_manager.add_embeddings(
-            session_id=self.session_id,
-            agent=self.agent,
-            stage=self.stage,
+            session_id=session_id,
+            agent=agent,
+            stage=stage,
             embeddings=embeddings,
             documents=documents,
             metadatas=metadatas,
-            namespace=self.namespace
-        ):
-    '''
-    '''
+            namespace=namespace
+        )
+
+    def _scope(self) -> Tuple:
+        return (self.session_id, self.agent, self.stage, self.namespace)
+
+    async def queue_embeddings(self, embeddings, documents=None, metadatas=None):
+        """
+        Like add_embeddings, but coalesces calls into a single backend
+        insert per session/agent/stage. Call flush() at request boundaries.
+        """
+        count = len(embeddings)
+        scope = self._scope()
+        self._pending.extend(zip(
+            [scope] * count,
+            embeddings,
+            documents or [None] * count,
+            metadatas or [None] * count,
+        ))
+
+        if len(self._pending) >= _MAX_BATCH:
+            await self.flush()
+        elif self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+            self._flush_task.add_done_callback(self._timer_done)
+
+    async def flush(self):
+        """
+        Send all queued embeddings, one add_embeddings call per
+        session/agent/stage. Also raises the failure of an earlier
+        background flush that no caller has seen yet.
+        """
+        await self._send_pending()
+        error, self._flush_error = self._flush_error, None
+        if error is not None:
+            raise error
+
+    async def _send_pending(self):
+        async with self._flush_lock:
+            pending, self._pending = self._pending, []
+            if not pending:
+                return
+
+            groups: Dict[Tuple, List[Tuple[Any, Any, Any]]] = {}
+            for scope, *item in pending:
+                groups.setdefault(scope, []).append(item)
+
+            for scope, items in groups.items():
+                embeddings, documents, metadatas = zip(*items)
+                await self._add_embeddings(
+                    scope,
+                    list(embeddings),
+                    documents=list(documents) if any(d is not None for d in documents) else None,
+                    metadatas=list(metadatas) if any(m is not None for m in metadatas) else None,
+                )
+
+    async def _flush_later(self):
+        await asyncio.sleep(_FLUSH_MS / 1000)
+        await self._send_in_background()
+
+    async def _send_in_background(self):
+        try:
+            await self._send_pending()
+        except Exception as e:
+            # Nobody awaits this task; the next flush() raises it
+            if self._flush_error is None:
+                self._flush_error = e
+
+    def _timer_done(self, task: asyncio.Task):
+        # Timer cancelled (teardown) before it sent the queue: send it
+        # anyway rather than dropping it with the timer
+        if task.cancelled() and self._pending:
+            sender = asyncio.get_running_loop().create_task(self._send_in_background())
+            self._senders.add(sender)
+            sender.add_done_callback(self._senders.discard)
+
     async def semantic_search(
         self, 
         query: str, 
@@ -109,14 +250,40 @@ class MemoryContext:
         limit: Optional[int] = None,
         filters: Optional[Dict[str, Any]] = None
         ):
-        return await self.memory_manager.query(
+        top_k = top_k or self.top_k
+        limit = limit or self.limit
+
+        try:
+            key = (
+                query,
+                self.key_namespace,
+                self.task,
+                top_k,
+                limit,
+                tuple(sorted(filters.items())) if filters else None,
+            )
+            hash(key)
+        except TypeError:
+            # Unhashable filter values; don't cache
+            key = None
+
+        if key is not None:
+            cached = self.query_cache.get(key)
+            if cached is not None:
+                return list(cached)
+
+        results = await self.memory_manager.query(
             query=query,
             key_namespace=self.key_namespace,
-            top_k=top_k or self.top_k,
-            limit=limit or self.limit,
+            top_k=top_k,
+            limit=limit,
             filters=filters
         )
-    '''
+
+        if key is not None:
+            self.query_cache.put(key, list(results))
+        return results
+
     # ----------------------------
     # Context scoping
     # ----------------------------
@@ -129,7 +296,8 @@ class MemoryContext:
             stage=self.stage,
             task=self.task,
             top_k=self.top_k,
-            limit=self.limit
+            limit=self.limit,
+            query_cache=self.query_cache
         )
 
     def with_stage(self, stage: str) -> "MemoryContext":
@@ -141,7 +309,8 @@ class MemoryContext:
             stage=stage,
             task=self.task,
             top_k=self.top_k,
-            limit=self.limit
+            limit=self.limit,
+            query_cache=self.query_cache
         )
 
     def with_task(self, task: str) -> "MemoryContext":
@@ -153,7 +322,8 @@ class MemoryContext:
             stage=self.stage,
             task=task,
             top_k=self.top_k,
-            limit=self.limit
+            limit=self.limit,
+            query_cache=self.query_cache
         )
 
     def with_namespace(self, namespace: str) -> "MemoryContext":
@@ -165,7 +335,8 @@ class MemoryContext:
             stage=self.stage,
             task=self.task,
             top_k=self.top_k,
-            limit=self.limit
+            limit=self.limit,
+            query_cache=self.query_cache
         )
 
     def generate_key_namespace(self)  -> "MemoryContext":
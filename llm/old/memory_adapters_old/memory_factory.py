@@ -1,16 +1,18 @@
 # memory_factory.py
 
-from typing import Dict, Any, List, Type, Optional
+from pathlib import Path
+from typing import Callable, Dict, Any, List, Type, Optional
 from pydantic import BaseModel
+import redis.asyncio as aioredis
 
-from llm.embeddings.base import EmbeddingStore
+from runtime.embedding_store_old import EmbeddingStore
 
-from llm.memory_adapters.base import MemoryAdapter
-from llm.memory_adapters.redis_adapter import RedisEpisodicAdapter
-from llm.memory_adapters.langmem_adapter import LangMemSemanticAdapter
-from llm.memory_adapters.local_memory_adapter_bm25 import LocalMemoryAdapter
-from llm.memory_adapters.postgres_adapter import PostgresAdapter
-from llm.memory_adapters.oracle_adapter import OracleAdapter
+from llm.old.memory_adapters_old.base import MemoryAdapter
+from llm.old.memory_adapters_old.redis_adapter import RedisEpisodicAdapter
+from llm.old.memory_adapters_old.langmem_adapter import LangMemSemanticAdapter
+from llm.old.memory_adapters_old.local_memory_adapter_bm25 import LocalMemoryAdapter
+from llm.old.memory_adapters_old.postgres_adapter import PostgresAdapter
+from llm.old.memory_adapters_old.oracle_adapter import OracleAdapter
 
 #from llm.llm_manager import ModelManager
 
@@ -37,6 +39,129 @@ SCHEMA_REGISTRY: Dict[str, Type[BaseModel]] = {
 }
 
 
+# ---------------------------------------------------------------------------
+# Adapter builders
+# ---------------------------------------------------------------------------
+
+# One connection pool per Redis URL, shared by every adapter in the process
+_REDIS_POOLS: Dict[str, aioredis.ConnectionPool] = {}
+
+
+def _redis_pool(redis_config: Dict[str, Any]) -> aioredis.ConnectionPool:
+    url = redis_config.get("url", "redis://localhost:6379/0")
+    pool = _REDIS_POOLS.get(url)
+    if pool is None:
+        pool = aioredis.ConnectionPool.from_url(
+            url,
+            max_connections=redis_config.get("max_connections", 50),
+            # Payloads are MessagePack bytes
+            decode_responses=False,
+        )
+        _REDIS_POOLS[url] = pool
+    return pool
+
+
+def _build_redis(config: Dict[str, Any], **_) -> MemoryAdapter:
+    redis_config = config.get("redis", {})
+    return RedisEpisodicAdapter(
+        config=redis_config,
+        pool=_redis_pool(redis_config),
+    )
+
+
+def _build_local(
+    config: Dict[str, Any],
+    *,
+    workspace_name: Optional[str] = None,
+    persist_path: Optional[str] = None,
+    **_,
+) -> MemoryAdapter:
+    if not workspace_name:
+        raise ValueError(
+            "LocalMemoryAdapter requires workspace_name"
+        )
+
+    return LocalMemoryAdapter(
+        workspace_name=workspace_name,
+        persist_dir=Path(persist_path) if persist_path else None,
+    )
+
+
+def _build_postgres(config: Dict[str, Any], *, kind: str, **_) -> MemoryAdapter:
+    dsn = config.get("dsn")
+    if not dsn:
+        raise ValueError(
+            f"Postgres {kind} backend requires a DSN"
+        )
+
+    return PostgresAdapter(
+        dsn=dsn,
+        table_name=config.get("table_name", f"{kind}_memories"),
+        pool_min=config.get("pool_min", 2),
+        pool_max=config.get("pool_max", 20),
+        stmt_cache=config.get("stmt_cache", 1024),
+        max_inactive_lifetime=config.get("max_inactive_lifetime", 300),
+    )
+
+
+def _build_oracle(config: Dict[str, Any], *, kind: str, **_) -> MemoryAdapter:
+    dsn = config.get("dsn")
+    if not dsn:
+        raise ValueError(
+            f"Oracle {kind} backend requires a DSN"
+        )
+
+    return OracleAdapter(
+        dsn=dsn,
+        table_name=config.get("table_name", f"{kind}_memories"),
+    )
+
+
+def _build_langmem(
+    config: Dict[str, Any],
+    *,
+    llm_manager: Any = None,
+    embedding_store: Optional[EmbeddingStore] = None,
+    **_,
+) -> MemoryAdapter:
+    if not llm_manager:
+        raise ValueError(
+            "LangMem semantic memory requires an LLM"
+        )
+    if not embedding_store:
+        raise ValueError(
+            "LangMem semantic memory requires an EmbeddingStore"
+        )
+
+    schemas: List[Type[BaseModel]] = []
+    for name in config.get("schemas", []):
+        if name not in SCHEMA_REGISTRY:
+            raise ValueError(
+                f"Unknown memory schema: {name}"
+            )
+        schemas.append(SCHEMA_REGISTRY[name])
+
+    return LangMemSemanticAdapter(
+        chat_model=llm_manager,
+        schemas=schemas,
+    )
+
+
+# backend name -> builder
+_EPISODIC_BUILDERS: Dict[str, Callable[..., MemoryAdapter]] = {
+    "redis": _build_redis,
+    "local-in-memory": _build_local,
+    "postgres": _build_postgres,
+    "oracle": _build_oracle,
+}
+
+_SEMANTIC_BUILDERS: Dict[str, Callable[..., MemoryAdapter]] = {
+    "langmem": _build_langmem,
+    "postgres": _build_postgres,
+    "oracle": _build_oracle,
+}
+
+
 # ---------------------------------------------------------------------------
 # MemoryFactory
 # ---------------------------------------------------------------------------
@@ -56,7 +181,7 @@ class MemoryFactory:
 
     def __init__(self):
         self.logger = AgentLogger.get_logger(
-            None, component="memory_factory"
+            component="module", module="memory_factory"
         )
 
     # ---------------------------------------------------------------------
@@ -75,76 +200,20 @@ class MemoryFactory:
 
         Intended to be wrapped by create_manage_memory_tool.
         """
-        if not config:
-            return None
-
-        backend = config.get("backend")
+        backend = config.get("backend") if config else None
         if not backend:
             return None
 
-        backend = backend.lower()
-
-        # ----------------------------
-        # Redis
-        # ----------------------------
-        if backend == "redis":
-            return RedisEpisodicAdapter(
-                config=config.get("redis", {})
-            )
-
-        # ----------------------------
-        # Local in-memory
-        # ----------------------------
-        if backend == "local-in-memory":
-            if not workspace_name:
-                raise ValueError(
-                    "LocalMemoryAdapter requires workspace_name"
-                )
-
-            return LocalMemoryAdapter(
-                workspace_name=workspace_name,
-                persist_path=persist_path,
-            )
-
-        # ----------------------------
-        # Postgres
-        # ----------------------------
-        if backend == "postgres":
-            dsn = config.get("dsn")
-            table_name = config.get(
-                "table_name", "episodic_memories"
-            )
-
-            if not dsn:
-                raise ValueError(
-                    "Postgres episodic backend requires a DSN"
-                )
-
-            return PostgresAdapter(
-                dsn=dsn,
-                table_name=table_name,
-            )
-
-        # ----------------------------
-        # Oracle
-        # ----------------------------
-        if backend == "oracle":
-            dsn = config.get("dsn")
-            table_name = config.get(
-                "table_name", "episodic_memories"
-            )
-
-            if not dsn:
-                raise ValueError(
-                    "Oracle episodic backend requires a DSN"
-                )
-
-            return OracleAdapter(
-                dsn=dsn,
-                table_name=table_name,
-            )
+        builder = _EPISODIC_BUILDERS.get(backend.lower())
+        if builder is None:
+            return None
 
-        return None
+        return builder(
+            config,
+            workspace_name=workspace_name,
+            persist_path=persist_path,
+            kind="episodic",
+        )
 
     # ---------------------------------------------------------------------
     # Semantic Memory (Embeddings / Retrieval)
@@ -154,7 +223,7 @@ class MemoryFactory:
     def get_semantic_adapter(
         config: Dict[str, Any],
         *,
-        llm_manager: LLMManager = None,
+        llm_manager: "LLMManager" = None,
         embedding_store: Optional[EmbeddingStore] = None,
     ) -> Optional[MemoryAdapter]:
         """
@@ -162,80 +231,17 @@ class MemoryFactory:
 
         Intended to be wrapped by create_search_memory_tool.
         """
-        if not config:
-            return None
-
-        backend = config.get("backend")
+        backend = config.get("backend") if config else None
         if not backend:
             return None
 
-        backend = backend.lower()
-
-        # ----------------------------
-        # LangMem
-        # ----------------------------
-        if backend == "langmem":
-            if not llm_manager:
-                raise ValueError(
-                    "LangMem semantic memory requires an LLM"
-                )
-            if not embedding_store:
-                raise ValueError(
-                    "LangMem semantic memory requires an EmbeddingStore"
-                )
-
-            schema_names = config.get("schemas", [])
-            schemas: List[Type[BaseModel]] = []
-
-            for name in schema_names:
-                if name not in SCHEMA_REGISTRY:
-                    raise ValueError(
-                        f"Unknown memory schema: {name}"
-                    )
-                schemas.append(SCHEMA_REGISTRY[name])
-
-            return LangMemSemanticAdapter(
-                chat_model=llm_manager,
-                schemas=schemas,
-            )
-
-        # ----------------------------
-        # Postgres
-        # ----------------------------
-        if backend == "postgres":
-            dsn = config.get("dsn")
-            table_name = config.get(
-                "table_name", "semantic_memories"
-            )
-
-            if not dsn:
-                raise ValueError(
-                    "Postgres semantic backend requires a DSN"
-                )
-
-            return PostgresAdapter(
-                dsn=dsn,
-                table_name=table_name,
-            )
-
-        # ----------------------------
-        # Oracle
-        # ----------------------------
-        if backend == "oracle":
-            dsn = config.get("dsn")
-            table_name = config.get(
-                "table_name", "semantic_memories"
-            )
-
-            if not dsn:
-                raise ValueError(
-                    "Oracle semantic backend requires a DSN"
-                )
-
-            return OracleAdapter(
-                dsn=dsn,
-                table_name=table_name,
-            )
-
-        return None
+        builder = _SEMANTIC_BUILDERS.get(backend.lower())
+        if builder is None:
+            return None
 
+        return builder(
+            config,
+            llm_manager=llm_manager,
+            embedding_store=embedding_store,
+            kind="semantic",
+        )
@@ -1,48 +1,92 @@
 # runtime/memory_adapters/oracle_adapter.py
-import json
+import orjson
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 import oracledb
 from pydantic import BaseModel
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
-from llm.memory_adapters.base import MemoryAdapter
+from llm.old.memory_adapters_old.base import MemoryAdapter, namespace_keys
 from llm.memory_schemas import EpisodicMemory, SemanticMemory
 
+
+# The table is created outside the adapter. fetch_memory orders by an
+# insertion-ordered id; tables created without one get it on first connect
+_ID_COLUMN_DDL = "ADD (id NUMBER GENERATED BY DEFAULT AS IDENTITY)"
+
+# ORA-01430: column being added already exists in table
+_ORA_COLUMN_EXISTS = 1430
+
+# fetch_memory filter columns; bit i of a fetch mask is set when column i
+# is filtered on, and the bit after them when a row limit applies
+_FETCH_COLUMNS = ("session_id", "agent", "stage", "namespace")
+
 class OracleAdapter(MemoryAdapter):
-    def __init__(self, dsn: str, table_name: str = "memories"):
+    def __init__(self, dsn: str, table_name: str = "memories", pool_max: int = 5):
         self.dsn = dsn
         self.table_name = table_name
+        self.pool_max = pool_max
         self.pool: Optional[oracledb.SessionPool] = None
+        # fetch_memory SQL for every mask, built once so the driver's
+        # statement cache sees the same text on every call
+        self._fetch_sql: List[str] = [
+            self._build_fetch_sql(mask) for mask in range(1 << (len(_FETCH_COLUMNS) + 1))
+        ]
+        # One thread per pooled connection, so blocking driver calls never
+        # queue behind unrelated work on the loop's default executor
+        self._executor = ThreadPoolExecutor(
+            max_workers=pool_max, thread_name_prefix="oracle-io"
+        )
 
     async def _init_pool(self):
         if self.pool is None:
-            loop = asyncio.get_event_loop()
-            self.pool = await loop.run_in_executor(None, lambda: oracledb.create_pool(user="user", password="pass", dsn=self.dsn, min=1, max=5))
+            loop = asyncio.get_running_loop()
+            pool = await loop.run_in_executor(self._executor, lambda: oracledb.create_pool(user="user", password="pass", dsn=self.dsn, min=1, max=self.pool_max))
             # Table creation can be handled outside in production
+            await loop.run_in_executor(self._executor, self._migrate, pool)
+            self.pool = pool
+
+    def _migrate(self, pool):
+        """Add the id column to tables that predate it."""
+        with pool.acquire() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "SELECT column_name FROM user_tab_columns WHERE table_name = UPPER(:1)",
+                    [self.table_name],
+                )
+                columns = {name for (name,) in cur}
+                if not columns or "ID" in columns:
+                    return
+                try:
+                    # Oracle numbers the existing rows when the column is added
+                    cur.execute(f"ALTER TABLE {self.table_name} {_ID_COLUMN_DDL}")
+                except oracledb.DatabaseError as e:
+                    # Another adapter added it first
+                    if e.args[0].code != _ORA_COLUMN_EXISTS:
+                        raise
 
     async def store_memory(
         self,
         memory: Union[Dict, BaseModel, EpisodicMemory]
     ) -> str:
         memory_dict = memory.model_dump()
-        keys = dict(memory_dict.get("key_namespace"))
+        keys = namespace_keys(memory.key_namespace)
         await self._init_pool()
-        loop = asyncio.get_event_loop()
-        async with asyncio.Lock():
-            def _insert():
-                with self.pool.acquire() as conn:
-                    with conn.cursor() as cur:
-                        cur.execute(
-                            f"INSERT INTO {self.table_name} (session_id, agent, stage, namespace, task, memory) VALUES (:1, :2, :3, :4, :5, :6) RETURNING rowid INTO :6",
-                            (keys.get("session_id"), 
-                             keys.get("agent"),
-                             keys.get("stage"), 
-                             keys.get("namespace"),
-                             memory_dict.get("task"),
-                             json.dumps(memory_dict), None)
-                        )
-                        return cur.fetchone()[0]
-            key = await loop.run_in_executor(None, _insert)
+        loop = asyncio.get_running_loop()
+        def _insert():
+            with self.pool.acquire() as conn:
+                with conn.cursor() as cur:
+                    cur.execute(
+                        f"INSERT INTO {self.table_name} (session_id, agent, stage, namespace, task, memory) VALUES (:1, :2, :3, :4, :5, :6) RETURNING rowid INTO :6",
+                        (keys.get("session_id"), 
+                         keys.get("agent"),
+                         keys.get("stage"), 
+                         keys.get("namespace"),
+                         memory_dict.get("task"),
+                         orjson.dumps(memory_dict).decode(), None)
+                    )
+                    return cur.fetchone()[0]
+        key = await loop.run_in_executor(self._executor, _insert)
         return key
 
     async def fetch_memory(
@@ -53,37 +97,51 @@ class OracleAdapter(MemoryAdapter):
         limit: Optional[int] = None
     ) -> List[Dict[str, Any]]:
 
-        keys=dict(key_namespace)
+        keys = namespace_keys(key_namespace)
         session_id = keys["session_id"]
         agent      = keys["agent"]
         stage      = keys["stage"]
         namespace  = keys["namespace"]
 
+        mask = 0
+        params = {}
+        values = (session_id, agent, stage, namespace, top_k)
+        for bit, (name, value) in enumerate(zip(_FETCH_COLUMNS + ("k",), values)):
+            if value:
+                mask |= 1 << bit
+                params[name] = value
+        query = self._fetch_sql[mask]
+
         await self._init_pool()
-        loop = asyncio.get_event_loop()
-        async with asyncio.Lock():
-            def _query():
-                with self.pool.acquire() as conn:
-                    with conn.cursor() as cur:
-                        query = f"SELECT memory FROM {self.table_name} WHERE 1=1"
-                        params = {}
-                        if session_id:
-                            query += " AND session_id = :session_id"
-                            params["session_id"] = session_id
-                        if agent:
-                            query += " AND agent = :agent"
-                            params["agent"] = agent
-                        if stage:
-                            query += " AND stage = :stage"
-                            params["stage"] = stage
-                        if namespace:
-                            query += " AND namespace = :namespace"
-                            params["namespace"] = namespace
-                        cur.execute(query, params)
-                        return [json.loads(r[0]) for r in cur.fetchall()]
-            return (await loop.run_in_executor(None, _query))[:top_k]
-
-    
+        loop = asyncio.get_running_loop()
+        def _query():
+            with self.pool.acquire() as conn:
+                with conn.cursor() as cur:
+                    # Fetch in top_k-sized round trips and decode row by row,
+                    # so neither the driver nor we hold the whole result twice
+                    cur.arraysize = min(top_k or 50, 500)
+                    cur.prefetchrows = cur.arraysize + 1
+                    cur.execute(query, params)
+                    out = []
+                    for (blob,) in cur:
+                        out.append(orjson.loads(blob))
+                        if top_k and len(out) >= top_k:
+                            break
+                    return out
+        return await loop.run_in_executor(self._executor, _query)
+
+    def _build_fetch_sql(self, mask: int) -> str:
+        query = f"SELECT memory FROM {self.table_name} WHERE 1=1"
+        for bit, column in enumerate(_FETCH_COLUMNS):
+            if mask & (1 << bit):
+                query += f" AND {column} = :{column}"
+        # Newest first, like the Postgres adapter; without an ORDER BY the
+        # row limit would keep whichever rows the plan happens to return
+        query += " ORDER BY id DESC"
+        if mask & (1 << len(_FETCH_COLUMNS)):
+            query += " FETCH FIRST :k ROWS ONLY"
+        return query
+
     async def add_embeddings(
         self,
         memory: Union[Dict, BaseModel, SemanticMemory]
@@ -114,13 +172,20 @@ class OracleAdapter(MemoryAdapter):
 
     async def clear(self, session_id=None):
         await self._init_pool()
-        loop = asyncio.get_event_loop()
-        async with asyncio.Lock():
-            def _clear():
-                with self.pool.acquire() as conn:
-                    with conn.cursor() as cur:
-                        if session_id:
-                            cur.execute(f"DELETE FROM {self.table_name} WHERE session_id = :1", [session_id])
-                        else:
-                            cur.execute(f"DELETE FROM {self.table_name}")
-            await loop.run_in_executor(None, _clear)
\ No newline at end of file
+        loop = asyncio.get_running_loop()
+        def _clear():
+            with self.pool.acquire() as conn:
+                with conn.cursor() as cur:
+                    if session_id:
+                        cur.execute(f"DELETE FROM {self.table_name} WHERE session_id = :1", [session_id])
+                    else:
+                        cur.execute(f"DELETE FROM {self.table_name}")
+        await loop.run_in_executor(self._executor, _clear)
+
+    async def aclose(self):
+        """Close the session pool and stop the I/O threads."""
+        if self.pool is not None:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self._executor, self.pool.close)
+            self.pool = None
+        self._executor.shutdown(wait=False)
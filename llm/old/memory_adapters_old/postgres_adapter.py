@@ -1,20 +1,55 @@
 from pydantic import BaseModel
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Union
 import asyncpg
-import json
-from llm.memory_adapters.base import MemoryAdapter
+import orjson
+from llm.old.memory_adapters_old.base import MemoryAdapter, namespace_keys
+from llm.old.memory_adapters_old.write_coalescer import WriteCoalescer
 from llm.memory_schemas import EpisodicMemory, SemanticMemory
 
 
+# fetch_memory filter columns; bit i of a fetch mask is set when column i
+# is filtered on, and the bit after them when a LIMIT applies
+_FETCH_COLUMNS = ("session_id", "agent", "stage", "namespace")
+
+
 class PostgresAdapter(MemoryAdapter):
-    def __init__(self, dsn: str, table_name: str = "memories"):
+    supports_filter_pushdown = True
+
+    def __init__(
+        self,
+        dsn: str,
+        table_name: str = "memories",
+        pool_min: int = 2,
+        pool_max: int = 20,
+        stmt_cache: int = 1024,
+        max_inactive_lifetime: float = 300,
+    ):
         self.dsn = dsn
         self.table_name = table_name
+        self.pool_min = pool_min
+        self.pool_max = pool_max
+        self.stmt_cache = stmt_cache
+        self.max_inactive_lifetime = max_inactive_lifetime
         self.pool: Optional[asyncpg.Pool] = None
+        # fetch_memory SQL per (mask, number of extra filters), built once;
+        # identical text lets asyncpg reuse the prepared statement on each
+        # connection
+        self._fetch_sql: Dict[Tuple[int, int], str] = {}
+        # Concurrent store_memory calls share one INSERT round trip
+        self._writes = WriteCoalescer(self._insert_batch)
 
     async def _init_pool(self):
         if self.pool is None:
-            self.pool = await asyncpg.create_pool(dsn=self.dsn)
+            self.pool = await asyncpg.create_pool(
+                dsn=self.dsn,
+                min_size=self.pool_min,
+                max_size=self.pool_max,
+                statement_cache_size=self.stmt_cache,
+                max_cacheable_statement_size=4096,
+                max_inactive_connection_lifetime=self.max_inactive_lifetime,
+                command_timeout=30,
+                init=self._init_connection,
+            )
             # Ensure table exists
             async with self.pool.acquire() as conn:
                 await conn.execute(
@@ -24,36 +59,63 @@ class PostgresAdapter(MemoryAdapter):
                         session_id TEXT,
                         agent TEXT,
                         stage TEXT,
+                        namespace TEXT,
                         task TEXT,
                         memory JSONB
-                    )
+                    );
+                    -- Serves every fetch_memory filter prefix, newest first
+                    CREATE INDEX IF NOT EXISTS {self.table_name}_lookup_idx
+                        ON {self.table_name} (session_id, agent, stage, namespace, id DESC);
                     """
                 )
 
+    @staticmethod
+    async def _init_connection(conn: asyncpg.Connection):
+        # JSONB goes over the wire in binary (version byte + JSON) and is
+        # (de)serialized by orjson, so memory columns are plain dicts
+        await conn.set_type_codec(
+            "jsonb",
+            encoder=lambda value: b"\x01" + orjson.dumps(value),
+            decoder=lambda data: orjson.loads(data[1:]),
+            schema="pg_catalog",
+            format="binary",
+        )
+
     async def store_memory(
         self,
         memory: Union[Dict, BaseModel, EpisodicMemory]
         # namespace: Optional[str] = None
     ) -> str:
-        memory_dict = memory.model_dump()
-        keys = dict(memory_dict.get("key_namespace"))
+        # One dump, JSON-safe, serves both the columns and the JSONB payload
+        memory_dict = memory.model_dump(mode="json")
+        keys = namespace_keys(memory.key_namespace)
         await self._init_pool()
-        memory_dict = memory.model_dump()
+        row = (
+            keys.get("session_id"),
+            keys.get("agent"),
+            keys.get("stage"),
+            keys.get("namespace"),
+            memory_dict.get("task"),
+            memory_dict,
+        )
+        return str(await self._writes.submit(row))
+
+    async def _insert_batch(self, rows: List[tuple]) -> List[int]:
+        """
+        Insert all rows with one statement; returns ids in row order.
+        """
+        columns = list(zip(*rows))
         async with self.pool.acquire() as conn:
-            result = await conn.fetchrow(
+            result = await conn.fetch(
                 f"""
                 INSERT INTO {self.table_name} (session_id, agent, stage, namespace, task, memory)
-                VALUES ($1, $2, $3, $4, $5, $6)
+                SELECT * FROM unnest($1::text[], $2::text[], $3::text[], $4::text[], $5::text[], $6::jsonb[])
                 RETURNING id
                 """,
-                keys.get("session_id"),
-                keys.get("agent"),
-                keys.get("stage"),
-                keys.get("namespace"),
-                memory_dict.get("task"),
-                json.dumps(memory_dict),
+                *[list(col) for col in columns],
             )
-        return str(result["id"])
+        # SERIAL ids are assigned in unnest order
+        return sorted(r["id"] for r in result)
 
     async def fetch_memory(
         self,
@@ -64,31 +126,52 @@ class PostgresAdapter(MemoryAdapter):
     ) -> List[Dict[str, Any]]:
 
 
-        keys=dict(key_namespace)
+        keys = namespace_keys(key_namespace)
         session_id = keys["session_id"]
         agent      = keys["agent"]
         stage      = keys["stage"]
         namespace  = keys["namespace"]
 
         await self._init_pool()
-        query = f"SELECT memory FROM {self.table_name} WHERE 1=1"
+        mask = 0
         params = []
-        if session_id:
-            params.append(session_id)
-            query += f" AND session_id = :session_id"
-        if agent:
-            params.append(agent)
-            query += f" AND agent = :agent"
-        if stage:
-            params.append(stage)
-            query += f" AND stage = :stage"
-        if namespace:
-            params.append(namespace)
-            query += f" AND task = :namespace"
+        for bit, value in enumerate((session_id, agent, stage, namespace, top_k)):
+            if value:
+                mask |= 1 << bit
+                params.append(value)
+        filters = filters or {}
+        # Extra filters run server-side as (key, value) parameter pairs;
+        # the LIMIT bound stays last
+        at = len(params) - bool(top_k)
+        params[at:at] = [x for item in filters.items() for x in item]
+
+        key = (mask, len(filters))
+        query = self._fetch_sql.get(key)
+        if query is None:
+            query = self._fetch_sql[key] = self._build_fetch_sql(*key)
 
         async with self.pool.acquire() as conn:
             rows = await conn.fetch(query, *params)
-        return [dict(row["memory"]) for row in rows[:top_k]]
+        return [row["memory"] for row in rows]
+
+    def _build_fetch_sql(self, mask: int, n_filters: int) -> str:
+        query = f"SELECT memory FROM {self.table_name} WHERE 1=1"
+        n = 0
+        for bit, column in enumerate(_FETCH_COLUMNS):
+            if mask & (1 << bit):
+                n += 1
+                query += f" AND {column} = ${n}"
+        for _ in range(n_filters):
+            # Equality of the key's value, as the in-memory fallback's
+            # m.get(k) == v; a missing key and a None filter value both
+            # compare as JSON null
+            query += f" AND coalesce(memory -> ${n + 1}::text, 'null') = coalesce(${n + 2}::jsonb, 'null')"
+            n += 2
+        # Newest first; only top_k rows ever leave the server
+        query += " ORDER BY id DESC"
+        if mask & (1 << len(_FETCH_COLUMNS)):
+            query += f" LIMIT ${n + 1}"
+        return query
 
     async def clear(self, session_id: Optional[str] = None):
         await self._init_pool()
@@ -100,10 +183,35 @@ class PostgresAdapter(MemoryAdapter):
 
     async def add_embeddings(
         self,
-        memory: Union[Dict, BaseModel, SemanticMemory]
+        memory: Union[Dict, BaseModel, SemanticMemory, List[SemanticMemory]]
     ) -> None:
-        """Add embeddings to the semantic store."""
-        return
+        """
+        Add semantic memories. A list is written with one COPY, which
+        avoids per-row INSERT framing and planning on bulk backfills.
+        """
+        memories = memory if isinstance(memory, list) else [memory]
+        records = []
+        for m in memories:
+            memory_dict = m.model_dump(mode="json")
+            keys = namespace_keys(m.key_namespace or ())
+            records.append((
+                keys.get("session_id"),
+                keys.get("agent"),
+                keys.get("stage"),
+                keys.get("namespace"),
+                memory_dict.get("task"),
+                memory_dict,
+            ))
+        if not records:
+            return
+
+        await self._init_pool()
+        async with self.pool.acquire() as conn:
+            await conn.copy_records_to_table(
+                self.table_name,
+                records=records,
+                columns=["session_id", "agent", "stage", "namespace", "task", "memory"],
+            )
 
     async def semantic_search(
         self,
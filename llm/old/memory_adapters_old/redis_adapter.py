@@ -1,27 +1,90 @@
 import asyncio
-import json
+import os
+import time
+from functools import lru_cache
+import msgspec
+import orjson
+from pydantic import BaseModel
 from typing import Any, Dict, List, Optional, Union
-from uuid import uuid4
+from uuid import UUID
 import redis.asyncio as aioredis 
-from llm.memory_adapters.base import MemoryAdapter
+from llm.old.memory_adapters_old.base import MemoryAdapter, namespace_keys
+from llm.old.memory_adapters_old.write_coalescer import WriteCoalescer
 from llm.memory_schemas import EpisodicMemory, SemanticMemory
 
+
+_last_ms = 0
+_counter = 0
+
+# Set once the memories written before the idx:* sorted sets existed have
+# been added to them; not matched by idx:* or by the backfill scan
+_BACKFILL_MARKER = "idx-backfilled"
+
+# Keys per SCAN page and per backfill pipeline
+_BACKFILL_BATCH = 1000
+
+
+def _uuid7() -> UUID:
+    """
+    Time-ordered UUID (RFC 9562 version 7): 48-bit millisecond timestamp,
+    12-bit counter for ids created in the same millisecond, 62 random bits.
+    Keys therefore sort by creation time.
+    """
+    global _last_ms, _counter
+    ms = time.time_ns() // 1_000_000
+    if ms <= _last_ms:
+        _counter += 1
+        if _counter > 0xFFF:
+            _last_ms += 1
+            _counter = 0
+        ms = _last_ms
+    else:
+        _last_ms, _counter = ms, 0
+    rand_b = int.from_bytes(os.urandom(8), "big") & ((1 << 62) - 1)
+    return UUID(int=(ms << 80) | (0x7 << 76) | (_counter << 64) | (0b10 << 62) | rand_b)
+
+
+@lru_cache(maxsize=4096)
+def _key_prefix(key_namespace: tuple) -> str:
+    """session_id:agent:stage:namespace, formatted once per namespace."""
+    keys = namespace_keys(key_namespace)
+    return f"{keys['session_id']}:{keys['agent']}:{keys['stage']}:{keys['namespace']}"
+
+
 class RedisEpisodicAdapter(MemoryAdapter):
 
-    def __init__(self, config: dict):
+    def __init__(self, config: dict, pool: Optional[aioredis.ConnectionPool] = None):
         self.redis_url = config.get("url", "redis://localhost:6379/0")
         # self.namespace = config.get("namespace", "episodic")
         self.ttl_seconds = config.get("ttl_seconds")
 
-        self.redis = aioredis.from_url(self.redis_url)
+        # Memories are stored as MessagePack: smaller in Redis and faster
+        # to decode than JSON
+        self._encoder = msgspec.msgpack.Encoder()
+        self._decoder = msgspec.msgpack.Decoder(dict)
+
+        # A shared pool lets adapters reuse open connections instead of
+        # each holding its own
+        if pool is not None:
+            self.redis = aioredis.Redis(connection_pool=pool)
+        else:
+            self.redis = aioredis.from_url(self.redis_url)
+
+        # Concurrent store_memory calls share one pipeline round trip
+        self._writes = WriteCoalescer(self._write_batch)
+
+        self._backfilled = False
+        self._backfill_lock = asyncio.Lock()
 
     def _key(self, key_namespace:tuple, uid: str):
-        keys=dict(key_namespace)
-        session_id = keys["session_id"]
-        agent      = keys["agent"]
-        stage      = keys["agent"]
-        namespace  = keys["namespace"]
-        return f"{session_id}:{agent}:{stage}:{namespace}:{uid}"
+        return f"{_key_prefix(key_namespace)}:{uid}"
+
+    def _index_key(self, key_namespace: tuple) -> str:
+        """
+        Sorted set of the memory keys stored under key_namespace,
+        scored by insertion time.
+        """
+        return f"idx:{_key_prefix(key_namespace)}"
 
     async def store_memory(
         self,
@@ -32,16 +95,39 @@ class RedisEpisodicAdapter(MemoryAdapter):
         Stores a memory object in Redis. Returns the generated key.
         """
   
-        key = str(uuid4())
+        key = str(_uuid7())
         redis_key = self._key(memory.key_namespace, key)
 
-        await self.redis.set(
-            redis_key,
-            memory.summary.model_dump_json(),
-            ex=self.ttl_seconds,  # 👈 TTL HERE
+        summary = memory.summary
+        if isinstance(summary, BaseModel):
+            summary = summary.model_dump()
+
+        index_key = self._index_key(memory.key_namespace)
+        await self._writes.submit(
+            (redis_key, index_key, self._encoder.encode(summary), time.time())
         )
         return redis_key
 
+    async def _write_batch(self, writes: List[tuple]) -> List[None]:
+        pipe = self.redis.pipeline(transaction=False)
+        for redis_key, index_key, payload, score in writes:
+            pipe.set(
+                redis_key,
+                payload,
+                ex=self.ttl_seconds,  # 👈 TTL HERE
+            )
+            pipe.zadd(index_key, {redis_key: score})
+        if self.ttl_seconds:
+            cutoff = time.time() - self.ttl_seconds
+            for index_key in {w[1] for w in writes}:
+                # Members whose keys have expired; writes keep the index
+                # itself alive, so they are never dropped with it
+                pipe.zremrangebyscore(index_key, "-inf", cutoff)
+                # The index outlives its newest member by at most one TTL
+                pipe.expire(index_key, self.ttl_seconds)
+        await pipe.execute()
+        return [None] * len(writes)
+
 
     async def fetch_memory(
         self,
@@ -54,20 +140,23 @@ class RedisEpisodicAdapter(MemoryAdapter):
         Fetch stored memories filtered by task, agent, or stage.
         Returns list of memory dicts.
         """
-        keys=dict(key_namespace)
-        session_id = keys["session_id"]
-        agent      = keys["agent"]
-        stage      = keys["stage"]
-        namespace  = keys["namespace"]
+        await self._ensure_backfilled()
+        index_key = self._index_key(key_namespace)
 
-        keys = await self.redis.keys(f"{session_id}:{agent}:{stage}:{namespace}:*")
-        results = []
+        # Two round trips regardless of how many memories match: read the
+        # newest top_k keys from the index, then fetch their payloads at once
+        members = await self.redis.zrevrange(index_key, 0, top_k - 1 if top_k else -1)
+        if not members:
+            return []
+        raws = await self.redis.mget(members)
 
-        for key in keys:
-            raw = await self.redis.get(key)
+        results = []
+        expired = []
+        for key, raw in zip(members, raws):
             if not raw:
+                expired.append(key)
                 continue
-            memory = json.loads(raw)
+            memory = self._decode(raw)
 
             '''
             # ---- Session Filter
@@ -91,13 +180,85 @@ class RedisEpisodicAdapter(MemoryAdapter):
 
             results.append(memory)
 
+        if expired:
+            await self.redis.zrem(index_key, *expired)
+
         return results
 
-    async def clear(self):
-        """Delete all keys in this namespace."""
-        keys = await self.redis.keys(f"{self.namespace}:*")
-        if keys:
-            await self.redis.delete(*keys)
+    async def _ensure_backfilled(self):
+        """
+        Index memories stored before the idx:* sorted sets existed. Runs
+        one SCAN per database; later calls only check a flag.
+        """
+        if self._backfilled:
+            return
+        async with self._backfill_lock:
+            if self._backfilled:
+                return
+            if not await self.redis.exists(_BACKFILL_MARKER):
+                batch = []
+                async for key in self.redis.scan_iter(count=_BACKFILL_BATCH):
+                    name = key.decode() if isinstance(key, bytes) else key
+                    # Memory keys are session_id:agent:stage:namespace:uid
+                    if name.startswith("idx:") or name.count(":") < 4:
+                        continue
+                    batch.append(name)
+                    if len(batch) >= _BACKFILL_BATCH:
+                        await self._backfill(batch)
+                        batch = []
+                if batch:
+                    await self._backfill(batch)
+                await self.redis.set(_BACKFILL_MARKER, 1)
+            self._backfilled = True
+
+    async def _backfill(self, keys: List[str]):
+        # Creation time is unknown: without a TTL they sort oldest first
+        scores = {key: 0.0 for key in keys}
+        if self.ttl_seconds:
+            # Recover the write time from the remaining TTL, so the
+            # zremrangebyscore in _write_batch prunes them on time
+            now = time.time()
+            pipe = self.redis.pipeline(transaction=False)
+            for key in keys:
+                pipe.ttl(key)
+            for key, remaining in zip(keys, await pipe.execute()):
+                if remaining == -2:  # expired since the scan
+                    del scores[key]
+                elif remaining >= 0:
+                    scores[key] = now - (self.ttl_seconds - remaining)
+                else:  # no expiry of its own
+                    scores[key] = now
+
+        pipe = self.redis.pipeline(transaction=False)
+        for key, score in scores.items():
+            pipe.zadd(f"idx:{key.rsplit(':', 1)[0]}", {key: score}, nx=True)
+        await pipe.execute()
+
+    def _decode(self, raw: bytes) -> Dict[str, Any]:
+        try:
+            return self._decoder.decode(raw)
+        except msgspec.DecodeError:
+            # Written before the switch to MessagePack
+            return orjson.loads(raw)
+
+    async def clear(self, key_namespace: tuple = None):
+        """
+        Delete all memories under key_namespace, or every indexed
+        memory when no namespace is given.
+        """
+        await self._ensure_backfilled()
+        if key_namespace is not None:
+            index_keys = [self._index_key(key_namespace)]
+        else:
+            index_keys = [k async for k in self.redis.scan_iter(match="idx:*")]
+
+        for index_key in index_keys:
+            members = await self.redis.zrange(index_key, 0, -1)
+            pipe = self.redis.pipeline(transaction=False)
+            if members:
+                pipe.delete(*members)
+            pipe.delete(index_key)
+            await pipe.execute()
 
     
     async def add_embeddings(
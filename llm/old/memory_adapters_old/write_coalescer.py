@@ -0,0 +1,108 @@
+# llm/memory_adapters/write_coalescer.py
+
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional, Set, Tuple
+
+
+class WriteCoalescer:
+    """
+    Groups writes that arrive close together into one backend call.
+
+    Each submit() waits for its own result. When no flush is running, a
+    write is flushed right away (together with anything submitted in the
+    same loop iteration). While a flush is running, writes queue up and go
+    out as one batch when it finishes, when max_batch items are pending,
+    or flush_ms after the first one arrived, whichever comes first.
+    flush_fn receives the items in submission order and must return one
+    result per item, in the same order.
+
+    Batches are flushed in their own tasks, so cancelling one submitter
+    never strands the others: every future of a batch is resolved, failed
+    or cancelled.
+    """
+
+    def __init__(
+        self,
+        flush_fn: Callable[[List[Any]], Awaitable[List[Any]]],
+        max_batch: int = 64,
+        flush_ms: float = 5,
+    ):
+        self.flush_fn = flush_fn
+        self.max_batch = max_batch
+        self.flush_ms = flush_ms
+
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._timer: Optional[asyncio.Task] = None
+        # Strong references, so in-flight flushes aren't garbage collected
+        self._flushes: Set[asyncio.Task] = set()
+
+    async def submit(self, item: Any) -> Any:
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((item, future))
+
+        if len(self._pending) >= self.max_batch or not self._flushing():
+            self._spawn_flush()
+        elif self._timer is None or self._timer.done():
+            self._timer = asyncio.create_task(self._flush_later())
+
+        return await future
+
+    async def flush(self):
+        """Send up to max_batch pending writes as one batch."""
+        batch = self._pending[:self.max_batch]
+        self._pending = self._pending[self.max_batch:]
+        if not batch:
+            return
+
+        items = [item for item, _ in batch]
+        try:
+            results = await self.flush_fn(items)
+        except BaseException as e:
+            for _, future in batch:
+                if future.done():
+                    continue
+                if isinstance(e, asyncio.CancelledError):
+                    future.cancel()
+                else:
+                    future.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+        if len(results) < len(batch):
+            error = RuntimeError(
+                f"flush_fn returned {len(results)} results for {len(batch)} items"
+            )
+            for _, future in batch[len(results):]:
+                if not future.done():
+                    future.set_exception(error)
+
+    def _spawn_flush(self):
+        if not self._pending:
+            return
+        task = asyncio.create_task(self.flush())
+        self._flushes.add(task)
+        task.add_done_callback(self._flush_done)
+
+    def _flushing(self) -> bool:
+        # done() rather than membership: a finished task stays in the set
+        # until its done callback runs, after its submitters have resumed
+        return any(not task.done() for task in self._flushes)
+
+    def _flush_done(self, task: asyncio.Task):
+        self._flushes.discard(task)
+        # Writes that queued behind this flush go out now, not on the timer
+        if self._pending and not self._flushing():
+            self._spawn_flush()
+
+    async def _flush_later(self):
+        try:
+            await asyncio.sleep(self.flush_ms / 1000)
+        finally:
+            # Also on cancellation: the pending batch still gets flushed
+            # (or failed) rather than left waiting on a timer that is gone
+            self._spawn_flush()
@@ -10,17 +10,20 @@ it only stores and retrieves memory via structured keys.
 """
 
 import asyncio
-from collections import defaultdict
+from collections import OrderedDict
+from functools import lru_cache
+import heapq
+from itertools import chain, count
+from operator import itemgetter
+import numpy as np
 from pydantic import BaseModel
-from typing import Dict, Any, List, Optional, Union
-from langmem.knowledge.extraction import  MemoryStoreManager
+from typing import Callable, Dict, Any, List, NamedTuple, Optional, Sequence, Union
 
-from llm.memory_adapters.base import MemoryAdapter
-from llm.memory_adapters.memory_factory import MemoryFactory
+from llm.old.memory_adapters_old.base import MemoryAdapter
+from llm.old.memory_adapters_old.write_coalescer import WriteCoalescer
 from llm.memory_schemas import EpisodicMemory, SemanticMemory
 
-from llm.embeddings.base import EmbeddingStore
-from llm.embeddings.embedding_factory import EmbeddingFactory 
+from llm.embeddings.adapters.base_client import BaseEmbeddingClient
 #from llm.llm_manager import LLMManager 
 
 
@@ -28,6 +31,662 @@ from llm.embeddings.embedding_factory import EmbeddingFactory
 
 from runtime.logger import AgentLogger
 
+try:
+    import faiss
+except ImportError:  # optional, the semantic fallback then scans every vector
+    faiss = None
+
+# Guards against division by zero for all-zero vectors
+_EPS = 1e-12
+
+# Rows preallocated for the exact-scan matrix and bucket columns; doubled
+# when full
+_INITIAL_CAPACITY = 64
+
+# Payload fields kept as columns in each fallback bucket, so filters on
+# them are vectorized compares
+_FILTER_COLUMNS = ("task", "category")
+
+# Column values of these types are also kept in a per-bucket inverted index
+_POSTING_TYPES = (str, int, float, bool)
+
+# Fallback bounds: rows per bucket before the oldest quarter is evicted, and
+# sessions kept before the least recently used one is dropped
+_MAX_PER_BUCKET = 10_000
+_MAX_SESSIONS = 1024
+
+# HNSW search breadth of the semantic fallback (store_config "ef_search")
+_EF_SEARCH = 100
+
+# Up to this many vectors are scanned exactly; past it an HNSW graph is
+# built from them in one bulk add
+_FLAT_MAX_ROWS = 4096
+
+# Training vectors per IVF list before the semantic index is compressed
+_PQ_TRAIN_PER_LIST = 39
+
+# Evicted vectors stay in the semantic index, skipped by search, until
+# there are more of them than live ones (and at least this many)
+_COMPACT_MIN_DEAD = 1024
+
+
+class _NamespaceFields(NamedTuple):
+    session_id: Any
+    agent: Any
+    stage: Any
+    namespace: Any
+
+
+@lru_cache(maxsize=1024)
+def _cached_namespace_fields(key_namespace: tuple) -> _NamespaceFields:
+    keys = dict(key_namespace)
+    return _NamespaceFields(*(keys.get(f) for f in _NamespaceFields._fields))
+
+
+def _namespace_fields(key_namespace: tuple) -> _NamespaceFields:
+    """
+    (session_id, agent, stage, namespace) of a key_namespace. Split once
+    per distinct namespace; unhashable ones are not cached.
+    """
+    try:
+        return _cached_namespace_fields(key_namespace)
+    except TypeError:
+        keys = dict(key_namespace)
+        return _NamespaceFields(*(keys.get(f) for f in _NamespaceFields._fields))
+
+
+def _build_filter(items: tuple) -> Callable[[Dict[str, Any]], bool]:
+    if not items:
+        return lambda m: True
+    # Keys and values are bound as globals of the generated function, never
+    # spliced into its source
+    env: Dict[str, Any] = {}
+    terms = []
+    for i, (k, v) in enumerate(items):
+        env[f"k{i}"], env[f"v{i}"] = k, v
+        terms.append(f"m.get(k{i}) == v{i}")
+    exec(f"def pred(m):\n    return {' and '.join(terms)}\n", env)
+    return env["pred"]
+
+
+_cached_filter = lru_cache(maxsize=256)(_build_filter)
+
+
+def _compile_filter(filters: Optional[Dict[str, Any]]) -> Callable[[Dict[str, Any]], bool]:
+    """
+    Predicate m -> all(m.get(k) == v for k, v in filters.items()), generated
+    as one straight-line `and` chain. Compiled once per distinct filter set;
+    filters with unhashable values are compiled per call.
+    """
+    items = tuple(filters.items()) if filters else ()
+    try:
+        return _cached_filter(items)
+    except TypeError:
+        return _build_filter(items)
+
+
+def _namespace_matches(want: tuple, have: tuple) -> bool:
+    """Empty fields in want match anything."""
+    return all(not w or w == h for w, h in zip(want, have))
+
+
+# ------------------------------------------------------------------
+# In-memory fallback store
+# ------------------------------------------------------------------
+class _MemoryColumns:
+    """
+    One bucket of fallback memories stored column-wise: insertion sequence
+    numbers, the payload dicts, and object-array columns for
+    _FILTER_COLUMNS. Payloads are only touched for the rows returned.
+
+    Each column also keeps an inverted index {value: [rows]}, so a filtered
+    select starts from the shortest posting list instead of scanning the
+    whole bucket.
+
+    At max_rows the oldest quarter is dropped in one shift, so eviction is
+    amortized O(1) per append and the bucket never outgrows max_rows.
+    """
+
+    def __init__(self, max_rows: int = _MAX_PER_BUCKET):
+        self.max_rows = max_rows
+        self.n = 0
+        self.seq = np.empty(_INITIAL_CAPACITY, dtype=np.int64)
+        self.columns = {name: np.empty(_INITIAL_CAPACITY, dtype=object) for name in _FILTER_COLUMNS}
+        # {column: {value: [rows]}}, rows ascending
+        self.postings: Dict[str, Dict[Any, List[int]]] = {name: {} for name in _FILTER_COLUMNS}
+        self.payloads: List[Any] = []
+
+    def append(self, seq: int, payload: Any):
+        if self.n >= self.max_rows:
+            self._evict(max(1, self.max_rows // 4))
+        row = self.n
+        capacity = self.seq.shape[0]
+        if row == capacity:
+            capacity = min(capacity * 2, max(self.max_rows, row + 1))
+            grown = np.empty(capacity, dtype=np.int64)
+            grown[:row] = self.seq
+            self.seq = grown
+            for name, col in self.columns.items():
+                grown = np.empty(capacity, dtype=object)
+                grown[:row] = col
+                self.columns[name] = grown
+
+        self.seq[row] = seq
+        for name, col in self.columns.items():
+            value = payload.get(name) if isinstance(payload, dict) else None
+            col[row] = value
+            if isinstance(value, _POSTING_TYPES):
+                self.postings[name].setdefault(value, []).append(row)
+        self.payloads.append(payload)
+        self.n += 1
+
+    def _evict(self, k: int):
+        """Drop the oldest k rows and rebuild the postings for the rest."""
+        n = self.n - k
+        self.seq[:n] = self.seq[k:self.n]
+        for name, col in self.columns.items():
+            col[:n] = col[k:self.n]
+            # Release the evicted values, not just hide them past n
+            col[n:self.n] = None
+            postings = self.postings[name] = {}
+            for row, value in enumerate(col[:n]):
+                if isinstance(value, _POSTING_TYPES):
+                    postings.setdefault(value, []).append(row)
+        del self.payloads[:k]
+        self.n = n
+
+    def select(self, filters: Optional[Dict[str, Any]], top_k: Optional[int]) -> List[tuple]:
+        """(seq, payload) of the latest top_k rows passing filters, oldest first."""
+        n = self.n
+        if not filters:
+            rows = range(max(0, n - top_k) if top_k else 0, n)
+        else:
+            indexed = []
+            others = []
+            for name, value in filters.items():
+                # Only scalars are posted and compare elementwise against a column
+                if name in self.postings and isinstance(value, _POSTING_TYPES):
+                    indexed.append((name, value))
+                else:
+                    others.append((name, value))
+
+            if indexed:
+                # Seed from the most selective posting list, narrow by the rest
+                postings = [self.postings[name].get(value, ()) for name, value in indexed]
+                seed = min(range(len(indexed)), key=lambda j: len(postings[j]))
+                rows = np.asarray(postings[seed], dtype=np.intp)
+                for j, (name, value) in enumerate(indexed):
+                    if j != seed and rows.size:
+                        rows = rows[self.columns[name][rows] == value]
+            else:
+                rows = np.arange(n)
+            if others:
+                pred = _compile_filter(dict(others))
+                rows = [i for i in rows if pred(self.payloads[i])]
+            if top_k:
+                rows = rows[-top_k:]
+        return [(int(self.seq[i]), self.payloads[i]) for i in rows]
+
+
+class _KeyedMemories:
+    """
+    Memories bucketed by (session_id, agent, stage, namespace).
+
+    A fully specified key_namespace is a single lookup in a flat dict keyed
+    by all four fields; a partial one only visits the session's buckets,
+    never the individual memories.
+
+    Sessions are kept in LRU order; past max_sessions the least recently
+    used one is dropped with all of its buckets.
+    """
+
+    def __init__(self, max_per_bucket: int = _MAX_PER_BUCKET, max_sessions: int = _MAX_SESSIONS):
+        # {(session_id, agent, stage, namespace): _MemoryColumns}
+        self._buckets: Dict[tuple, _MemoryColumns] = {}
+        # {session_id: {(agent, stage, namespace): _MemoryColumns}}, LRU order
+        self._sessions: "OrderedDict[Any, Dict[tuple, _MemoryColumns]]" = OrderedDict()
+        self._max_per_bucket = max_per_bucket
+        self._max_sessions = max_sessions
+        self._seq = count()
+
+    def append(self, key_namespace: tuple, memory: Any):
+        fields = _namespace_fields(key_namespace)
+        bucket = self._buckets.get(fields)
+        if bucket is None:
+            bucket = self._buckets[fields] = _MemoryColumns(self._max_per_bucket)
+            self._add_bucket(fields, bucket)
+        else:
+            self._sessions.move_to_end(fields.session_id)
+        bucket.append(next(self._seq), memory)
+
+    def _add_bucket(self, fields: _NamespaceFields, bucket: _MemoryColumns):
+        session = self._sessions.get(fields.session_id)
+        if session is None:
+            session = self._sessions[fields.session_id] = {}
+            if len(self._sessions) > self._max_sessions:
+                session_id, dropped = self._sessions.popitem(last=False)
+                for bucket_key in dropped:
+                    del self._buckets[(session_id, *bucket_key)]
+        else:
+            self._sessions.move_to_end(fields.session_id)
+        session[fields[1:]] = bucket
+
+    def get(
+        self,
+        key_namespace: tuple,
+        top_k: Optional[int] = None,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[Any]:
+        """Latest top_k memories under key_namespace passing filters, oldest first."""
+        fields = _namespace_fields(key_namespace)
+        session_id, rest = fields.session_id, fields[1:]
+
+        if all(rest):
+            bucket = self._buckets.get(fields)
+            if bucket is None:
+                return []
+            self._sessions.move_to_end(session_id)
+            entries = bucket.select(filters, top_k)
+        else:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return []
+            self._sessions.move_to_end(session_id)
+            # Each bucket's rows are already in seq order: merge them, or keep
+            # only the top_k newest with a k-sized heap instead of a full sort
+            selected = [
+                bucket.select(filters, top_k)
+                for bucket_key, bucket in session.items()
+                if _namespace_matches(rest, bucket_key)
+            ]
+            if top_k:
+                entries = heapq.nlargest(top_k, chain.from_iterable(selected), key=itemgetter(0))
+                entries.reverse()
+            else:
+                entries = list(heapq.merge(*selected, key=itemgetter(0)))
+
+        return [memory for _, memory in entries]
+
+
+class _SemanticIndex:
+    """
+    Embedding index over the in-memory semantic fallback.
+
+    Vectors are L2-normalized so inner product is cosine similarity; each
+    is stored under a row id that never changes. Small indexes (and every
+    index when faiss is missing) are a contiguous float32 matrix scored with
+    one BLAS matrix-vector product; past _FLAT_MAX_ROWS they move to a faiss
+    HNSW graph.
+
+    Once nlist * 39 vectors have accumulated, the HNSW graph is replaced by
+    an IVF-PQ index trained on them: each vector is then stored as pq_m
+    pq_bits-bit codes (16 bytes by default) instead of dim float32s.
+
+    Bounded like _KeyedMemories: past max_per_bucket rows a bucket drops
+    its oldest quarter, past max_sessions the least recently used session
+    is dropped. Dropped rows are tombstoned, so search never returns them,
+    and the index is compacted once they outnumber the live rows.
+
+    Graphs and IVF-PQ indexes are built in a worker thread from a snapshot
+    of the live rows; add() and search() keep using the current index
+    until the new one is swapped in. add() must run on the event loop.
+    """
+
+    def __init__(
+        self,
+        connectivity: int = 16,
+        expansion_add: int = 64,
+        expansion_search: int = _EF_SEARCH,
+        nlist: int = 256,
+        pq_m: int = 16,
+        pq_bits: int = 8,
+        nprobe: int = 16,
+        max_per_bucket: int = _MAX_PER_BUCKET,
+        max_sessions: int = _MAX_SESSIONS,
+    ):
+        self.connectivity = connectivity
+        self.expansion_add = expansion_add
+        self.expansion_search = expansion_search
+        self.nlist = nlist
+        self.pq_m = pq_m
+        self.pq_bits = pq_bits
+        self.nprobe = nprobe
+        self.max_per_bucket = max_per_bucket
+        self.max_sessions = max_sessions
+
+        self._index = None                       # faiss index keyed by row id, once past _FLAT_MAX_ROWS
+        self._hnsw = None                        # graph inside _index, while not quantized
+        self._quantized = False                  # _index is an IndexIVFPQ
+        # (capacity, dim) unit vectors for the exact scan and the row id of
+        # each; the first self._rows are in use. Dropped once the graph is built.
+        self._matrix: Optional[np.ndarray] = None
+        self._ids: Optional[np.ndarray] = None
+        self._rows = 0                           # vectors held, live or tombstoned
+        # {row id: (payload, _namespace_fields)} of the live rows
+        self._entries: Dict[int, tuple] = {}
+        self._dead: set = set()                  # tombstoned row ids still in the index
+        # {session_id: {(agent, stage, namespace): [row ids]}}, LRU order
+        self._sessions: "OrderedDict[Any, Dict[tuple, List[int]]]" = OrderedDict()
+        self._next_id = count()
+        # Background build of the next index, and the (row id, vector)
+        # added since its snapshot
+        self._rebuilding: Optional[asyncio.Task] = None
+        self._backlog: Optional[List[tuple]] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, key_namespace: tuple, vector: Sequence[float], payload: Dict[str, Any]):
+        vec = np.asarray(vector, dtype=np.float32).reshape(1, -1)
+        vec /= np.linalg.norm(vec) + _EPS
+
+        row = next(self._next_id)
+        fields = _namespace_fields(key_namespace)
+        self._insert(vec, np.array([row], dtype=np.int64))
+        if self._backlog is not None:
+            self._backlog.append((row, vec))
+        self._entries[row] = (payload, fields)
+        self._track(fields, row)
+        self._maintain()
+
+    def _insert(self, vecs: np.ndarray, ids: np.ndarray):
+        if self._index is not None:
+            self._index.add_with_ids(vecs, ids)
+        else:
+            n, m = self._rows, len(ids)
+            buf = self._matrix
+            if buf is None:
+                buf = np.empty((max(_INITIAL_CAPACITY, m), vecs.shape[1]), dtype=np.float32)
+                self._ids = np.empty(buf.shape[0], dtype=np.int64)
+            elif n + m > buf.shape[0]:
+                # Geometric growth keeps inserts amortized O(1)
+                capacity = max(buf.shape[0] * 2, n + m)
+                grown = np.empty((capacity, buf.shape[1]), dtype=np.float32)
+                grown[:n] = buf[:n]
+                buf = grown
+                grown = np.empty(capacity, dtype=np.int64)
+                grown[:n] = self._ids[:n]
+                self._ids = grown
+            buf[n:n + m] = vecs
+            self._ids[n:n + m] = ids
+            self._matrix = buf
+        self._rows += len(ids)
+
+    def _track(self, fields: _NamespaceFields, row: int):
+        session = self._sessions.get(fields.session_id)
+        if session is None:
+            session = self._sessions[fields.session_id] = {}
+            if len(self._sessions) > self.max_sessions:
+                _, dropped = self._sessions.popitem(last=False)
+                for rows in dropped.values():
+                    self._drop(rows)
+        else:
+            self._sessions.move_to_end(fields.session_id)
+
+        rows = session.setdefault(fields[1:], [])
+        rows.append(row)
+        if len(rows) > self.max_per_bucket:
+            k = max(1, self.max_per_bucket // 4)
+            self._drop(rows[:k])
+            del rows[:k]
+
+    def _drop(self, rows: List[int]):
+        for row in rows:
+            del self._entries[row]
+        self._dead.update(rows)
+
+    def _maintain(self):
+        """Compact, or start moving to the next index type, when due."""
+        if self._rebuilding is not None:
+            return
+        live, dead = len(self), len(self._dead)
+        if dead > live and dead >= _COMPACT_MIN_DEAD:
+            if self._index is None or self._quantized:
+                self._compact()
+                return
+            # A graph can't drop nodes; rebuild it from the live rows
+            build = self._build_graph
+        elif self._index is None:
+            if faiss is None or live <= _FLAT_MAX_ROWS:
+                return
+            build = self._build_graph
+        elif (
+            not self._quantized
+            and live >= self.nlist * _PQ_TRAIN_PER_LIST
+            and self._index.d % self.pq_m == 0
+        ):
+            build = self._quantize
+        else:
+            return
+
+        vectors, ids = self._live_vectors()
+        self._backlog = []
+        self._rebuilding = asyncio.get_running_loop().create_task(self._rebuild(build, vectors, ids))
+
+    async def _rebuild(self, build: Callable, vectors: np.ndarray, ids: np.ndarray):
+        """
+        Build the next index off the event loop; searches keep using the
+        current one until it is swapped in.
+        """
+        try:
+            index, hnsw = await asyncio.to_thread(build, vectors, ids)
+        except Exception as e:
+            logger.error("Semantic fallback index rebuild failed: %s", e)
+            return
+        finally:
+            backlog, self._backlog = self._backlog, None
+            self._rebuilding = None
+
+        self._index, self._hnsw = index, hnsw
+        self._quantized = hnsw is None
+        self._matrix = self._ids = None
+        self._rows = index.ntotal
+        # Rows added since the snapshot go into the new index as well
+        for row, vec in backlog:
+            self._insert(vec, np.array([row], dtype=np.int64))
+        # Rows dropped since the snapshot are still in it
+        self._dead = {
+            row for row in chain(ids.tolist(), (row for row, _ in backlog))
+            if row not in self._entries
+        }
+        self._maintain()
+
+    def _live_vectors(self) -> tuple:
+        """(vectors, row ids) of the live rows, in insertion order; copies."""
+        if self._index is None:
+            vectors, ids = self._matrix[:self._rows], self._ids[:self._rows]
+        else:
+            vectors = self._hnsw.reconstruct_n(0, self._rows)
+            ids = faiss.vector_to_array(self._index.id_map)
+        live = np.fromiter((i in self._entries for i in ids.tolist()), dtype=bool, count=len(ids))
+        return vectors[live], ids[live]
+
+    def _compact(self):
+        """Drop tombstoned rows from the exact-scan matrix or the IVF-PQ index."""
+        if self._quantized:
+            self._index.remove_ids(np.fromiter(self._dead, dtype=np.int64, count=len(self._dead)))
+            self._rows = self._index.ntotal
+        else:
+            vectors, ids = self._live_vectors()
+            self._matrix = self._ids = None
+            self._rows = 0
+            self._insert(vectors, ids)
+        self._dead.clear()
+
+    def _build_graph(self, vectors: np.ndarray, ids: np.ndarray) -> tuple:
+        """(index, graph): an HNSW graph over the given rows. Runs in a worker thread."""
+        hnsw = faiss.IndexHNSWFlat(vectors.shape[1], self.connectivity, faiss.METRIC_INNER_PRODUCT)
+        hnsw.hnsw.efConstruction = self.expansion_add
+        index = faiss.IndexIDMap(hnsw)
+        index.add_with_ids(vectors, ids)
+        return index, hnsw
+
+    def _quantize(self, vectors: np.ndarray, ids: np.ndarray) -> tuple:
+        """(index, None): an IVF-PQ index trained on the given rows. Runs in a worker thread."""
+        dim = vectors.shape[1]
+        quantizer = faiss.IndexFlatIP(dim)
+        index = faiss.IndexIVFPQ(quantizer, dim, self.nlist, self.pq_m, self.pq_bits, faiss.METRIC_INNER_PRODUCT)
+        index.train(vectors)
+        index.add_with_ids(vectors, ids)
+        index.nprobe = self.nprobe
+        logger.info("Semantic fallback index compressed to IVF-PQ (%d vectors)", len(ids))
+        return index, None
+
+    def search(
+        self,
+        vector: Sequence[float],
+        top_k: int,
+        key_namespace: tuple,
+        filters: Optional[Dict[str, Any]] = None,
+        ef_search: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Payloads of the top_k nearest live rows under key_namespace that
+        pass filters, best first. Candidates are over-fetched until enough
+        pass.
+        """
+        n = self._rows
+        if not len(self) or not top_k:
+            return []
+
+        query = np.asarray(vector, dtype=np.float32).reshape(1, -1)
+        query /= np.linalg.norm(query) + _EPS
+        want = _namespace_fields(key_namespace)
+        pred = _compile_filter(filters)
+        if want.session_id in self._sessions:
+            self._sessions.move_to_end(want.session_id)
+
+        def _keep(row: int) -> bool:
+            entry = self._entries.get(row)
+            return entry is not None and _namespace_matches(want, entry[1]) and pred(entry[0])
+
+        k = min(n, top_k)
+        while True:
+            hits = [row for row in self._candidates(query, k, ef_search) if _keep(row)]
+            if len(hits) >= top_k or k == n:
+                return [self._entries[row][0] for row in hits[:top_k]]
+            k = min(n, k * 4)
+
+    def _candidates(self, query: np.ndarray, k: int, ef_search: Optional[int]) -> List[int]:
+        if self._index is not None:
+            if not self._quantized:
+                self._hnsw.hnsw.efSearch = max(ef_search or self.expansion_search, k)
+            _, ids = self._index.search(query, k)
+            return [int(i) for i in ids[0] if i >= 0]  # faiss pads with -1
+
+        # sgemv over the rows in use; BLAS runs it with FMA/SIMD kernels
+        scores = self._matrix[:self._rows] @ query[0]
+        top = np.argpartition(-scores, k - 1)[:k]
+        return self._ids[top[np.argsort(-scores[top])]].tolist()
+
+
+class _WriteBehind:
+    """
+    Bounded write-behind queue in front of an adapter write method.
+
+    put() returns as soon as the item is queued, waiting only while maxsize
+    writes are pending, with a future that settles once the adapter write
+    finished or failed. A drain task hands up to max_batch items at a time
+    to write_fn concurrently, so adapters that coalesce writes (Postgres,
+    Redis) send each batch in one round trip.
+
+    Pending writes are tracked per key, so a read waits only for writes to
+    its own key_namespace. Failed writes are kept until flush() raises them.
+    """
+
+    def __init__(self, write_fn: Callable[[Any], Any], maxsize: int = 10_000, max_batch: int = 64):
+        self.write_fn = write_fn
+        self.max_batch = max_batch
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self._drainer: Optional[asyncio.Task] = None
+        self._pending: Dict[Any, set] = {}
+        self._errors: List[BaseException] = []
+
+    async def put(self, key: Any, item: Any) -> asyncio.Future:
+        key = _hashable(key)
+        future = asyncio.get_running_loop().create_future()
+        self._pending.setdefault(key, set()).add(future)
+        future.add_done_callback(lambda f: self._settled(key, f))
+        try:
+            await self._queue.put((item, future))
+        except BaseException:
+            future.cancel()
+            raise
+        if self._drainer is None or self._drainer.done():
+            self._drainer = asyncio.create_task(self._drain())
+        return future
+
+    async def join(self, key: Any = None):
+        """
+        Wait until the queued writes for key (every key when None) have
+        reached the adapter.
+        """
+        if key is None:
+            pending = set().union(*self._pending.values())
+        else:
+            pending = set(self._pending.get(_hashable(key), ()))
+        if pending:
+            await asyncio.wait(pending)
+
+    async def flush(self):
+        """Wait for every queued write, then raise the first one that failed."""
+        await self.join()
+        errors, self._errors = self._errors, []
+        if errors:
+            raise errors[0]
+
+    def _settled(self, key: Any, future: asyncio.Future):
+        pending = self._pending.get(key)
+        if pending is not None:
+            pending.discard(future)
+            if not pending:
+                del self._pending[key]
+        if not future.cancelled() and future.exception() is not None:
+            logger.error("Queued memory write failed: %s", future.exception())
+            self._errors.append(future.exception())
+
+    async def _drain(self):
+        while not self._queue.empty():
+            batch = [self._queue.get_nowait() for _ in range(min(self.max_batch, self._queue.qsize()))]
+            try:
+                await asyncio.gather(*(self._write(item, future) for item, future in batch))
+            except BaseException:
+                # Torn down mid-batch: nobody is left to finish these writes
+                for _, future in batch:
+                    future.cancel()
+                raise
+
+    async def _write(self, item: Any, future: asyncio.Future):
+        # Each write settles its own future, so a read never waits on a
+        # slower write to another key that shares the batch
+        try:
+            result = await self.write_fn(item)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+            return
+        if not future.done():
+            future.set_result(result)
+
+
+def _hashable(key: Any) -> Any:
+    # key_namespace values may be lists; pending writes are then tracked
+    # under the namespace's repr
+    try:
+        hash(key)
+        return key
+    except TypeError:
+        return repr(key)
+
+
+def _memory_factory():
+    # Imported on first use: the factory pulls in every backend driver
+    # (redis, asyncpg, oracledb, langmem), which callers passing their own
+    # adapters or using the fallbacks don't need installed
+    from llm.old.memory_adapters_old.memory_factory import MemoryFactory
+    return MemoryFactory
+
+
 class MemoryManager:
     """
     Fully pluggable memory manager:
@@ -36,47 +695,70 @@ class MemoryManager:
     """
 
     def __init__(self, 
-        store_config: Dict[str, Any],
-        # store_manager:  MemoryStoreManager
-        #llm_manager: LLMManager,
-        #embedding_store: EmbeddingStore
+        store_config: Optional[Dict[str, Any]] = None,
+        *,
+        episodic_adapter: Optional[MemoryAdapter] = None,
+        semantic_adapter: Optional[MemoryAdapter] = None,
+        embedding_client: Optional[BaseEmbeddingClient] = None,
+        llm_manager: Any = None,
+        embedding_store: Any = None,
         ):
-        self.lock = asyncio.Lock()
-        #self.episodic_adapter = episodic
-        #self.semantic_adapter = semantic
-        self.in_memory_episodic: Dict[str, Dict[str, List[Dict]]] = defaultdict(lambda: defaultdict(list))
-        self.in_memory_semantic: Dict[str, Dict[str, List[Dict]]] = defaultdict(lambda: defaultdict(list))
+        """
+        Adapters may be passed in directly, or built by MemoryFactory from
+        the "episodic" / "semantic" sections of store_config. Without
+        either, the in-memory fallbacks are used.
+        """
+        store_config = store_config or {}
+
+        # Fallback stores are read and written without awaiting in between,
+        # so coroutines on the loop never see them half-updated; no lock
+        max_per_bucket = store_config.get("max_per_bucket", _MAX_PER_BUCKET)
+        max_sessions = store_config.get("max_sessions", _MAX_SESSIONS)
+        self.in_memory_episodic = _KeyedMemories(max_per_bucket, max_sessions)
+        self.in_memory_semantic = _KeyedMemories(max_per_bucket, max_sessions)
+        # Similarity search for the semantic fallback; needs embedding_client
+        self.embedding_client = embedding_client
+        self.semantic_index = _SemanticIndex(
+            expansion_search=store_config.get("ef_search", _EF_SEARCH),
+            max_per_bucket=max_per_bucket,
+            max_sessions=max_sessions,
+        )
+        # Concurrent add_embeddings calls share one encoder request
+        self._embed_writes = WriteCoalescer(self._embed_batch)
+        # Adapter writes are queued and drained in batches; reads wait for
+        # the queue first so callers still see their own writes
+        self._episodic_writes = _WriteBehind(lambda m: self.episodic_adapter.store_memory(m))
+        self._semantic_writes = _WriteBehind(lambda m: self.semantic_adapter.add_embeddings(m))
 
         self.dsn                = store_config.get("dsn", None)  # Data Source Name
         self.persist_directory  = store_config.get("persist_directory", None)
         self.collections        = store_config.get("collections", None)
         self.embedding_model    = store_config.get("embedding_model", None)
-        self.dims               = store_config.get("dims", None),  
+        self.dims               = store_config.get("dims", None)
 
         # Bind workspace logger ONCE
         global logger
-        logger = AgentLogger.get_logger(None, component="system")
+        logger = AgentLogger.get_logger(component="system")
 
         logger.info("Bootstrapping LLM ...")
-        logger.info(f" Data Source Name: {self.dsn}")
-        logger.info(f" Persisten Directory: {self.persist_directory}")
-        logger.info(f" Collections: {self.collections}")
-        logger.info(f" Embedding Model: {self.embedding_model}")
-        logger.info(f" Dim: {self.dims}")
-
-
-
-        self.episodic_adapter = MemoryFactory.get_episodic_adapter(
-            config["episodic"]
-        )
-        self.semantic_adapter = MemoryFactory.get_semantic_adapter(
-            config["semantic"],
-            llm_manager=llm_manager,
-            embedding_store=embedding_store,
-        )
-
-        #embedding_config = self.config.get("embeddings", {})
-        self.embedding_store = EmbeddingFactory.build(config=embedding_config, logger=self.logger)
+        logger.info(" Data Source Name: %s", self.dsn)
+        logger.info(" Persisten Directory: %s", self.persist_directory)
+        logger.info(" Collections: %s", self.collections)
+        logger.info(" Embedding Model: %s", self.embedding_model)
+        logger.info(" Dim: %s", self.dims)
+
+        if episodic_adapter is None and store_config.get("episodic"):
+            episodic_adapter = _memory_factory().get_episodic_adapter(
+                store_config["episodic"]
+            )
+        if semantic_adapter is None and store_config.get("semantic"):
+            semantic_adapter = _memory_factory().get_semantic_adapter(
+                store_config["semantic"],
+                llm_manager=llm_manager,
+                embedding_store=embedding_store,
+            )
+        self.episodic_adapter = episodic_adapter
+        self.semantic_adapter = semantic_adapter
 
     # ------------------------------
     # Store memory
@@ -87,10 +769,19 @@ class MemoryManager:
         task: str,
         memory: BaseModel 
     ):
-        async with self.lock:
-            await self.store_memory(key_namespace, task, memory)
-            await self.add_embeddings(key_namespace, task, memory)                
-            logger.debug(f"Stored memory for {agent} in session {session_id}")
+        # Episodic and semantic backends are independent; write both at once
+        await asyncio.gather(
+            self.store_memory(key_namespace, task, memory),
+            self.add_embeddings(key_namespace, task, memory),
+        )
+        logger.debug("Stored memory under %s", key_namespace)
+
+    async def flush(self):
+        """
+        Wait until every queued adapter write has been sent. Raises the
+        first write that failed since the last flush.
+        """
+        await asyncio.gather(self._episodic_writes.flush(), self._semantic_writes.flush())
 
     # ------------------------------------------------------------------
     # Episodic Memory
@@ -102,23 +793,25 @@ class MemoryManager:
         memory: Union[Dict, BaseModel, EpisodicMemory]
     ):
         """Store episodic memory"""
-        async with self.lock:
-            if isinstance(memory, dict):
-                episodic_memory = EpisodicMemory(
-                    key_namespace=key_namespace,
-                    task=task,
-                    summary=memory
-                )
-            if self.episodic_adapter:
-                await self.episodic_adapter.store_memory(episodic_memory)
-            else: # In-memory Fallback
-                episodic_memory = EpisodicMemory(
-                    task=task,
-                    summary=memory
-                )
-                # episodic_memory = memory.dict()
-                self.in_memory_episodic[key_namespace].append(episodic_memory)
-            logger.debug(f"Stored episodic memory for {agent} at stage {stage} in session {session_id}")
+        if isinstance(memory, dict):
+            # Fields come from our own callers; skip validation
+            episodic_memory = EpisodicMemory.model_construct(
+                key_namespace=key_namespace,
+                task=task,
+                summary=memory,
+            )
+        else:
+            episodic_memory = memory
+        if self.episodic_adapter:
+            await self._episodic_writes.put(key_namespace, episodic_memory)
+        else: # In-memory Fallback
+            # Plain dicts so filters can read fields; unset and None
+            # fields are skipped
+            self.in_memory_episodic.append(
+                key_namespace,
+                episodic_memory.model_dump(exclude_unset=True, exclude_none=True),
+            )
+        logger.debug("Stored episodic memory under %s", key_namespace)
 
 
     # ------------------------------
@@ -131,45 +824,47 @@ class MemoryManager:
         limit: int = 50,
         filters: Optional[Dict[str, Any]] = None,
     ) -> List[Dict[str, Any]]:
-        async with self.lock:
-            # Adaptger
-            if self.episodic_adapter:
+        # Adaptger
+        if self.episodic_adapter:
+            await self._episodic_writes.join(key_namespace)
+            if not filters or self.episodic_adapter.supports_filter_pushdown:
                 return await self.episodic_adapter.fetch_memory(
                     key_namespace=key_namespace,
                     filters=filters,
                     top_k=top_k,
                     limit=limit
                 )
-            else:
-            # In-memory Fallback
-                mems = []
-
+            # The backend cannot filter: top_k must apply after the filters,
+            # not to the unfiltered rows
+            mems = await self.episodic_adapter.fetch_memory(
+                key_namespace=key_namespace,
+                filters=filters,
+                top_k=None,
+                limit=limit
+            )
+            pred = _compile_filter(filters)
+            mems = [m for m in mems if pred(m)]
+            return mems[:top_k] if top_k else mems
+        else:
+        # In-memory Fallback
+            # Filters run column-wise over the key's buckets only
+            mems = self.in_memory_episodic.get(key_namespace, top_k, filters)
+
+            '''
+            if agent:
                 mems = self.in_memory_episodic[key_namespace].get(agent, [])
-
-                # Now let's break the key namespace into individual keys for filtering
-                session_id=key_namespace[1]
-                agent=key_namespace[2]
-                stage=key_namespace[3]
-                namespace=key_namespace[4]
-
-                if filters:
-                    mems = [m for m in mems if all(m.get(k) == v for k, v in filters.items())]
-
-                '''
-                if agent:
-                    mems = self.in_memory_episodic[key_namespace].get(agent, [])
-                else:
-                    mems = [m for a in self.in_memory_episodic[session_id].values() for m in a]
-                if stage:
-                    if isinstance(stage, str):
-                        mems = [m for m in mems if m.get("stage") == stage]
-                    else:  # list
-                        mems = [m for m in mems if m.get("stage") in stage]
-                if filters:
-                    mems = [m for m in mems if all(m.get(k) == v for k, v in filters.items())]
-                '''
-
-                return mems[-top_k:]
+            else:
+                mems = [m for a in self.in_memory_episodic[session_id].values() for m in a]
+            if stage:
+                if isinstance(stage, str):
+                    mems = [m for m in mems if m.get("stage") == stage]
+                else:  # list
+                    mems = [m for m in mems if m.get("stage") in stage]
+            if filters:
+                mems = [m for m in mems if all(m.get(k) == v for k, v in filters.items())]
+            '''
+
+            return mems[-top_k:]
 
     # ------------------------------------------------------------------
     # Semantic Store Embedding
@@ -182,23 +877,31 @@ class MemoryManager:
         memory: Union[Dict, BaseModel, SemanticMemory]
     ):
         """Store semantic memory"""
-        async with self.lock:
-            if isinstance(memory, dict):
-                semantic_memory = SemanticMemory(
-                    key_namespace=key_namespace,
-                    task=task, 
-                    summary=memory
-                )
-            if self.semantic_adapter:
-                await self.semantic_adapter.add_embeddings(semantic_memory)
-            else: # In-memory Fallback 
-                semantic_memory = SemanticMemory( 
-                    task=task, 
-                    summary=memory
+        if isinstance(memory, dict):
+            # Fields come from our own callers; skip validation
+            semantic_memory = SemanticMemory.model_construct(
+                key_namespace=key_namespace,
+                task=task,
+                summary=memory,
+            )
+        else:
+            semantic_memory = memory
+        if self.semantic_adapter:
+            await self._semantic_writes.put(key_namespace, semantic_memory)
+        else: # In-memory Fallback 
+            # Plain dicts so filters can read fields; unset and None
+            # fields are skipped
+            payload = semantic_memory.model_dump(exclude_unset=True, exclude_none=True)
+            self.in_memory_semantic.append(key_namespace, payload)
+            if self.embedding_client:
+                vector = await self._embed_writes.submit(
+                    f"{payload.get('task', '')}\n{payload.get('summary', '')}"
                 )
-                #mem = memory.dict()
-                self.in_memory_semantic[key_namespace].append(semantic_memory)
-            logger.debug(f"Stored semantic memory for {agent} in session {session_id}")
+                self.semantic_index.add(key_namespace, vector, payload)
+        logger.debug("Stored semantic memory under %s", key_namespace)
+
+    async def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        return await asyncio.to_thread(self.embedding_client.embed_texts, texts)
 
 
     # ------------------------------
@@ -213,30 +916,17 @@ class MemoryManager:
         limit: Optional[int] = None,
         filters: Optional[Dict[str, Any]] = None
     ) -> List[Dict[str, Any]]:
-        async with self.lock:
-            # Adapter
-            if self.semantic_adapter:
-                return await self.semantic_adapter.semantic_search(
-                    query=query,
-                    top_k=top_k,
-                    limit=limit,
-                    filters=filters,
-                )
-            else: # In-memory fallback
-                mems = []
-
-                if filters:
-                    mems = [m for m in mems if all(m.get(k) == v for k, v in filters.items())]
-
-                '''
-                if agent:
-                    mems = self.in_memory_semantic[session_id].get(agent, [])
-                else:
-                    mems = [m for a in self.in_memory_semantic[session_id].values() for m in a]
-                if filters:
-                    mems = [m for m in mems if all(m.get(k) == v for k, v in filter.items())]
-                '''
-                return mems[-top_k:]
+        # Adapter
+        if self.semantic_adapter:
+            await self._semantic_writes.join(key_namespace)
+            return await self.semantic_adapter.semantic_search(
+                query=query,
+                top_k=top_k,
+                limit=limit,
+                filters=filters,
+            )
+        else: # In-memory fallback
+            return await self._search_fallback(query, key_namespace, top_k, limit, filters)
 
     async def query(
         self,
@@ -246,27 +936,36 @@ class MemoryManager:
         limit: Optional[int] = None,
         filters: Optional[Dict[str, Any]] = None
     ) -> List[Dict[str, Any]]:
-        async with self.lock:
-            # Adapter
-            if self.semantic_adapter:
-                return await self.semantic_adapter.query(
-                    query=query,
-                    top_k=top_k,
-                    limit=limit,
-                    filters=filters,
-                )
-            else: # In-memory fallback
-                mems = []
-
-                if filters:
-                    mems = [m for m in mems if all(m.get(k) == v for k, v in filters.items())]
-
-                '''
-                if agent:
-                    mems = self.in_memory_semantic[session_id].get(agent, [])
-                else:
-                    mems = [m for a in self.in_memory_semantic[session_id].values() for m in a]
-                if filters:
-                    mems = [m for m in mems if all(m.get(k) == v for k, v in filter.items())]
-                '''
-                return mems[-top_k:]
+        # Adapter
+        if self.semantic_adapter:
+            await self._semantic_writes.join(key_namespace)
+            return await self.semantic_adapter.query(
+                query=query,
+                top_k=top_k,
+                limit=limit,
+                filters=filters,
+            )
+        else: # In-memory fallback
+            return await self._search_fallback(query, key_namespace, top_k, limit, filters)
+
+    async def _search_fallback(
+        self,
+        query: str,
+        key_namespace: tuple,
+        top_k: Optional[int],
+        limit: Optional[int],
+        filters: Optional[Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        """
+        Nearest semantic memories from the in-memory index, or the most
+        recent ones when no embedding client is configured. limit, when
+        given, caps the number of results.
+        """
+        if limit is not None:
+            top_k = min(top_k, limit) if top_k else limit
+
+        if self.embedding_client and len(self.semantic_index):
+            vector = await asyncio.to_thread(self.embedding_client.embed_text, query)
+            return self.semantic_index.search(vector, top_k or 5, key_namespace, filters)
+
+        return self.in_memory_semantic.get(key_namespace, top_k, filters)
@@ -12,7 +12,6 @@
 
 from __future__ import annotations
 
-import asyncio
 import time
 from typing import Any, Dict, List, Optional
 
@@ -30,7 +29,6 @@ class InMemoryEpisodicStore(EpisodicStore):
     """
 
     def __init__(self):
-        self._lock = asyncio.Lock()
         self._store: Dict[str, Dict[str, Any]] = {}
         self._order: List[str] = []
 
@@ -41,19 +39,18 @@ class InMemoryEpisodicStore(EpisodicStore):
         value: Dict[str, Any],
         ttl_seconds: Optional[int] = None,
     ) -> None:
-        async with self._lock:
-            expires_at = (
-                time.time() + ttl_seconds if ttl_seconds else None
-            )
+        expires_at = (
+            time.time() + ttl_seconds if ttl_seconds else None
+        )
 
-            self._store[key] = {
-                "value": value,
-                "created_at": time.time(),
-                "expires_at": expires_at,
-            }
+        self._store[key] = {
+            "value": value,
+            "created_at": time.time(),
+            "expires_at": expires_at,
+        }
 
-            if key not in self._order:
-                self._order.append(key)
+        if key not in self._order:
+            self._order.append(key)
 
     # ------------------------------------------------------------------
     async def fetch(
@@ -61,45 +58,42 @@ class InMemoryEpisodicStore(EpisodicStore):
         key: Optional[str] = None,
         limit: int = 10,
     ) -> List[Dict[str, Any]]:
-        async with self._lock:
-            now = time.time()
-
-            def valid(k: str) -> bool:
-                entry = self._store.get(k)
-                return (
-                    entry
-                    and (entry["expires_at"] is None or entry["expires_at"] > now)
-                )
-
-            keys = (
-                [key] if key else list(reversed(self._order))
+        now = time.time()
+
+        def valid(k: str) -> bool:
+            entry = self._store.get(k)
+            return (
+                entry
+                and (entry["expires_at"] is None or entry["expires_at"] > now)
+            )
+
+        keys = (
+            [key] if key else list(reversed(self._order))
+        )
+
+        results = []
+        for k in keys:
+            if not valid(k):
+                continue
+            results.append(
+                {
+                    "key": k,
+                    **self._store[k],
+                }
             )
+            if len(results) >= limit:
+                break
 
-            results = []
-            for k in keys:
-                if not valid(k):
-                    continue
-                results.append(
-                    {
-                        "key": k,
-                        **self._store[k],
-                    }
-                )
-                if len(results) >= limit:
-                    break
-
-            return results
+        return results
 
     # ------------------------------------------------------------------
     async def delete(self, key: str) -> None:
-        async with self._lock:
-            self._store.pop(key, None)
-            if key in self._order:
-                self._order.remove(key)
+        self._store.pop(key, None)
+        if key in self._order:
+            self._order.remove(key)
 
     # ------------------------------------------------------------------
     async def clear(self) -> None:
-        async with self._lock:
-            self._store.clear()
-            self._order.clear()
+        self._store.clear()
+        self._order.clear()
 
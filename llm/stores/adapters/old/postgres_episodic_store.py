@@ -3,6 +3,7 @@
 # -----------------------------------------------------------------------------
 
 import asyncpg
+import orjson
 from typing import Any, Dict, List, Optional
 
 from llm.stores.base import EpisodicStore
@@ -17,8 +18,19 @@ class PostgresEpisodicStore(EpisodicStore):
         self.dsn = dsn
         self.pool: asyncpg.Pool | None = None
 
+    @staticmethod
+    async def _init_connection(conn: asyncpg.Connection):
+        # JSONB <-> dict via orjson, binary wire format (version byte + JSON)
+        await conn.set_type_codec(
+            "jsonb",
+            encoder=lambda value: b"\x01" + orjson.dumps(value),
+            decoder=lambda data: orjson.loads(data[1:]),
+            schema="pg_catalog",
+            format="binary",
+        )
+
     async def initialize(self):
-        self.pool = await asyncpg.create_pool(self.dsn)
+        self.pool = await asyncpg.create_pool(self.dsn, init=self._init_connection)
         async with self.pool.acquire() as conn:
             await conn.execute(
                 """
@@ -10,8 +10,10 @@ AgentRegistry does NOT manage execution or routing.
 
 
 from __future__ import annotations
+import json
+import os
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set
 from agents.skills.agent import SkillAgent
 
 from runtime.runtime_context import RuntimeContext
@@ -67,10 +69,16 @@ class AgentRegistry:
             logger.warning(f"Agents directory does not exist: {self.agents_dir}")
             return
 
-        for agent_dir in sorted(self.agents_dir.iterdir()):
-            if not agent_dir.is_dir():
-                continue
+        # Exception types whose traceback has already been logged. When many
+        # agents fail for the same reason, only the first one pays for it.
+        seen_errors: Set[type] = set()
+
+        # scandir order is stable per filesystem, which is all registration
+        # needs; only the summary log below is sorted.
+        with os.scandir(self.agents_dir) as entries:
+            agent_dirs = [Path(entry.path) for entry in entries if entry.is_dir()]
 
+        for agent_dir in agent_dirs:
             skill_file = agent_dir / "skill.json"
 
             if not skill_file.exists():
@@ -98,13 +106,22 @@ class AgentRegistry:
                 self.register(agent)
                 logger.info(f"Loaded agent: {agent.role} ({skill_name})")
 
-            except Exception as e:
-                logger.error(
-                    f"Failed to load agent from {agent_dir}: {e}",
-                    # exc_info=True
-                )
+            except (FileNotFoundError, PermissionError, json.JSONDecodeError, ValueError) as e:
+                logger.warning(f"Failed to load agent from {agent_dir}: {e}")
 
-        logger.info(f"Registered agent roles: {self.roles()}")
+            except Exception as e:
+                if type(e) not in seen_errors:
+                    seen_errors.add(type(e))
+                    logger.error(
+                        f"Failed to load agent from {agent_dir}: {e}",
+                        exc_info=True
+                    )
+                else:
+                    logger.error(
+                        f"Failed to load agent from {agent_dir} (stack suppressed, see earlier): {e}"
+                    )
+
+        logger.info(f"Registered agent roles: {sorted(self._roles_ordered)}")
 
     # ------------------------------------------------------------------
     # Registration
@@ -117,7 +134,7 @@ class AgentRegistry:
             raise ValueError("Agent role cannot be empty")
 
         if role in self._agents:
-            self.logger.warning(
+            logger.warning(
                 f"Duplicate agent role '{role}' detected. Overwriting."
             )
 
@@ -1,9 +1,10 @@
 # runtime/config_loader.py
 
 from __future__ import annotations
+import copy
 import json
 from pathlib import Path
-from typing import Dict, Any
+from typing import ClassVar, Dict, Any, Tuple
 import hashlib
 
 
@@ -14,8 +15,18 @@ class ConfigLoader:
     Priority (lowest → highest):
       1. Global config.json
       2. Workspace config.json
+
+    Parsed and merged configs are cached across loaders; load() and get()
+    hand out deep copies, so callers may modify what they get.
     """
 
+    # Parsed files shared by all loaders:
+    #   {path: ((st_mtime_ns, st_size), data, sha256 of data)}
+    _file_cache: ClassVar[Dict[Path, Tuple[Tuple[int, int], Dict[str, Any], str]]] = {}
+    # Latest merge per (global path, workspace path):
+    #   ((global hash, workspace hash), config, config hash)
+    _merge_cache: ClassVar[Dict[Tuple[Path, Path | None], Tuple[Tuple[str, str | None], Dict[str, Any], str]]] = {}
+
     def __init__(
         self,
         global_config_path: Path,
@@ -25,6 +36,7 @@ class ConfigLoader:
         self.workspaces_root = workspaces_root
         self._config: Dict[str, Any] = {}
         self._config_hash: str | None = None
+        self._source_key: Tuple[str, str | None] | None = None
 
     # ------------------------------------------------------------------
     # Public API
@@ -37,22 +49,37 @@ class ConfigLoader:
         if not self.global_config_path.exists():
             raise FileNotFoundError(f"Global config not found: {self.global_config_path}")
 
-        global_config = self._load_json(self.global_config_path)
+        global_config, global_hash = self._load_json_cached(self.global_config_path)
 
-        workspace_config = {}
+        workspace_config, ws_hash, ws_config_path = {}, None, None
         if self.workspaces_root:
             ws_config_path = self.workspaces_root / "config.json"
             if ws_config_path.exists():
-                workspace_config = self._load_json(ws_config_path)
+                workspace_config, ws_hash = self._load_json_cached(ws_config_path)
+            else:
+                ws_config_path = None
 
-        self._config = self._deep_merge(global_config, workspace_config)
-        self._config_hash = self._compute_hash(self._config)
-        return self._config
+        # Neither file changed since this loader last merged them
+        key = (global_hash, ws_hash)
+        if self._config and key == self._source_key:
+            return copy.deepcopy(self._config)
+
+        paths = (self.global_config_path, ws_config_path)
+        merged = self._merge_cache.get(paths)
+        if merged is None or merged[0] != key:
+            config = self._deep_merge(global_config, workspace_config)
+            # Replaces the merge of the previous versions of these files
+            merged = (key, config, self._compute_hash(config))
+            self._merge_cache[paths] = merged
+
+        _, self._config, self._config_hash = merged
+        self._source_key = key
+        return copy.deepcopy(self._config)
 
     def get(self) -> Dict[str, Any]:
         if not self._config:
             raise RuntimeError("Config not loaded yet")
-        return self._config
+        return copy.deepcopy(self._config)
 
     def get_hash(self) -> str:
         if not self._config_hash:
@@ -63,6 +90,23 @@ class ConfigLoader:
     # Internal helpers
     # ------------------------------------------------------------------
 
+    def _load_json_cached(self, path: Path) -> Tuple[Dict[str, Any], str]:
+        """
+        Parse path unless its mtime and size match the cached copy.
+        Returns (data, content hash).
+        """
+        stat = path.stat()
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        cached = self._file_cache.get(path)
+        if cached is not None and cached[0] == signature:
+            return cached[1], cached[2]
+
+        data = self._load_json(path)
+        digest = self._compute_hash(data)
+        self._file_cache[path] = (signature, data, digest)
+        return data, digest
+
     def _load_json(self, path: Path) -> Dict[str, Any]:
         try:
             with path.open("r", encoding="utf-8") as f:
@@ -93,4 +137,3 @@ class ConfigLoader:
         """
         canonical = json.dumps(config, sort_keys=True, separators=(",", ":"))
         return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
-
@@ -1,16 +1,19 @@
 from fastapi import FastAPI, Request, HTTPException
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict
 from typing import Optional
 from runtime.singleton_resources import SingletonResources
 from runtime.runtime_factory import get_runtime
 
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
 session_control = SingletonResources.session_control  # singleton instance
 
 # ----------------------------
 # Request Schema
 # ----------------------------
 class RunTaskRequest(BaseModel):
+    model_config = ConfigDict(extra="ignore", str_strip_whitespace=False)
+
     task: str
     session_id: Optional[str] = None
     user_id: Optional[str] = None
@@ -23,7 +26,11 @@ class RunTaskResponse(BaseModel):
     task: str
     result: dict
 
-@app.post("/run_task", response_model=RunTaskResponse)
+@app.post(
+    "/run_task",
+    response_model=RunTaskResponse,
+    response_model_exclude_unset=True,
+)
 async def run_task(req: RunTaskRequest):
     try:
         user_id = req.user_id
@@ -70,25 +70,56 @@
 #
 # -----------------------------------------------------------------------------
 from __future__ import annotations
+import importlib
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 from runtime.logger import AgentLogger
 
 from runtime.bootstrap.config_loader import ConfigLoader
-from runtime.workspace_hub import WorkspaceHub
-from runtime.session_manager import SessionManager
 
-# LLM Model Manager
-from llm.model_manager import ModelManager
-
-# Tools
-from runtime.tools.tool_registry import ToolRegistry
-from runtime.tools.tool_policy import ToolPolicy
-from runtime.tools.tool_client import ToolClient
-
-from events.event_bus import EventBus
+if TYPE_CHECKING:
+    from runtime.workspace_hub import WorkspaceHub
+    from runtime.session_manager import SessionManager
+    from llm.model_manager import ModelManager
+    from runtime.tools.tool_registry import ToolRegistry
+    from runtime.tools.tool_policy import ToolPolicy
+    from runtime.tools.tool_client import ToolClient
+    from events.event_bus import EventBus
+
+__all__ = [
+    "Platform",
+    "WorkspaceHub",
+    "SessionManager",
+    "ModelManager",
+    "ToolRegistry",
+    "ToolPolicy",
+    "ToolClient",
+    "EventBus",
+]
+
+# Subsystems (and the LLM / embedding stacks they pull in) are imported
+# on first use, so importing this module only costs the logger and config
+_LAZY_IMPORTS = {
+    "WorkspaceHub": "runtime.workspace_hub",
+    "SessionManager": "runtime.session_manager",
+    "ModelManager": "llm.model_manager",
+    "ToolRegistry": "runtime.tools.tool_registry",
+    "ToolPolicy": "runtime.tools.tool_policy",
+    "ToolClient": "runtime.tools.tool_client",
+    "EventBus": "events.event_bus",
+}
+
+
+def __getattr__(name: str):
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
 
 
 class Platform:
@@ -102,7 +133,7 @@ class Platform:
     model_manager: ModelManager = None
     session_manager: SessionManager = None
     tool_registry: ToolRegistry = None
-    tool_policy: ToolPOlicy = None
+    tool_policy: ToolPolicy = None
     tool_client: ToolClient = None
     workspace_hub: WorkspaceHub = None
     event_bus: EventBus = None
@@ -119,6 +150,14 @@ class Platform:
         if self._initialized:
             return
 
+        from runtime.workspace_hub import WorkspaceHub
+        from runtime.session_manager import SessionManager
+        from llm.model_manager import ModelManager
+        from runtime.tools.tool_registry import ToolRegistry
+        from runtime.tools.tool_policy import ToolPolicy
+        from runtime.tools.tool_client import ToolClient
+        from events.event_bus import EventBus
+
         # --------------------------------------------------
         # Config
         # --------------------------------------------------
@@ -144,44 +183,55 @@ class Platform:
         tool_config_path = parent_path.parent / "tools" / "config.json" # runtime/tools/config.json
         tools_policy_path = workspaces_root / "tools_policy.json" # workspaces/tools_config.json
 
-        # --------------------------------------------------
-        # Tool Bootstrapping
-        # --------------------------------------------------
-    
-        self.tool_registry = ToolRegistry(tool_config_path)
-        self.tool_registry.load()
-
-        self.tool_policy = ToolPolicy(
-            json.loads(tools_policy_path.read_text())
-        )
-
-        self.tool_client = ToolClient(
-            registry=self.tool_registry,
-            policy=self.tool_policy,
-            agent_role="critic"
-        )
-        logger.info("ToolClient initialized")
-
-        # --------------------------------------------------
-        # Event Bus
-        # --------------------------------------------------
-        self.event_bus = EventBus()
-
-
-        # --------------------------------------------------
-        # LLM Model bootstrap
-        # --------------------------------------------------
-        self.model_manager = ModelManager(
-            chatmodel_provider="ollama:qwen2:0.5b",
-            embedding_provider="ollama:nomic-embed-text:latest",
-            store_provider="in-memory-ollama",  
-            llm_config = parent_path.parent.parent / "llm",
-        )
-
-        # --------------------------------------------------
-        # Session Bootstrapping
-        # --------------------------------------------------
-        self.session_manager = SessionManager()
+        def _load_tool_registry():
+            registry = ToolRegistry(tool_config_path)
+            registry.load()
+            return registry
+
+        # Tool registry, tool policy and the LLM stack don't depend on each
+        # other; load them side by side so startup takes as long as the
+        # slowest leg (usually the model) rather than their sum
+        with ThreadPoolExecutor(max_workers=3, thread_name_prefix="platform-init") as pool:
+
+            # --------------------------------------------------
+            # LLM Model bootstrap
+            # --------------------------------------------------
+            model_manager_future = pool.submit(
+                ModelManager,
+                chatmodel_provider="ollama:qwen2:0.5b",
+                embedding_provider="ollama:nomic-embed-text:latest",
+                store_provider="in-memory-ollama",
+                llm_config = parent_path.parent.parent / "llm",
+            )
+
+            # --------------------------------------------------
+            # Tool Bootstrapping
+            # --------------------------------------------------
+            tool_registry_future = pool.submit(_load_tool_registry)
+            tool_policy_future = pool.submit(
+                lambda: ToolPolicy(json.loads(tools_policy_path.read_text()))
+            )
+
+            # --------------------------------------------------
+            # Event Bus
+            # --------------------------------------------------
+            self.event_bus = EventBus()
+
+            # --------------------------------------------------
+            # Session Bootstrapping
+            # --------------------------------------------------
+            self.session_manager = SessionManager()
+
+            self.tool_registry = tool_registry_future.result()
+            self.tool_policy = tool_policy_future.result()
+            self.tool_client = ToolClient(
+                registry=self.tool_registry,
+                policy=self.tool_policy,
+                agent_role="critic"
+            )
+            logger.info("ToolClient initialized")
+
+            self.model_manager = model_manager_future.result()
 
         # --------------------------------------------------
         # Workspace Hub
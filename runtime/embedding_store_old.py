@@ -1,10 +1,78 @@
 from __future__ import annotations
 import asyncio
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
 from runtime.logger import AgentLogger
 
+try:
+    import faiss
+except ImportError:  # optional, only needed for index="hnsw"
+    faiss = None
+
+try:
+    from numba import njit, prange
+except ImportError:  # optional, small flat scans fall back to BLAS
+    njit = None
+
+# Guards against division by zero for all-zero vectors
+_EPS = 1e-12
+
+# Rows preallocated per (session, agent) matrix; doubled when full
+_INITIAL_CAPACITY = 64
+
+# Flat scans at least this large are scored off the event loop
+_OFFLOAD_ROWS = 8192
+
+# Matrices smaller than this use the Numba kernel (when available), which
+# avoids BLAS dispatch and threading overhead on thin matrices
+_JIT_MAX_ROWS = 4096
+
+
+def _top_k_indices(scores: np.ndarray, top_k: int) -> np.ndarray:
+    """
+    Indices of the top_k highest scores, best first.
+    Partitions in O(n) and sorts only the k survivors.
+    """
+    k = min(top_k, scores.size)
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    idx = np.argpartition(-scores, k - 1)[:k]
+    return idx[np.argsort(-scores[idx])]
+
+
+if njit is not None:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _dot_rows(matrix, query):
+        n, dim = matrix.shape
+        scores = np.empty(n, dtype=np.float32)
+        for i in prange(n):
+            acc = np.float32(0.0)
+            for j in range(dim):
+                acc += matrix[i, j] * query[j]
+            scores[i] = acc
+        return scores
+
+    # Compile at import (or load from the on-disk cache) so the first
+    # search doesn't pay for it
+    _dot_rows(np.zeros((1, 1), dtype=np.float32), np.zeros(1, dtype=np.float32))
+else:
+    _dot_rows = None
+
+
+def _score_views(views: List[np.ndarray], query: np.ndarray) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """
+    (scores, row ids) per matrix. Rows are unit length, so cosine
+    similarity is a plain dot product against each row.
+    """
+    scans = []
+    for view in views:
+        if _dot_rows is not None and view.shape[0] < _JIT_MAX_ROWS:
+            scores = _dot_rows(view, query)
+        else:
+            scores = view @ query
+        scans.append((scores, np.arange(view.shape[0])))
+    return scans
+
 
 class EmbeddingStore:
     """
@@ -12,37 +80,126 @@ class EmbeddingStore:
     Supports:
     - Multi-session embeddings
     - Top-K retrieval using cosine similarity
+    - Exact ("flat") or approximate FAISS HNSW ("hnsw") search
     """
 
-    def __init__(self):
-        # {session_id: {agent: [(embedding_vector, metadata)]}}
+    def __init__(self, index: str = "flat", hnsw_m: int = 32, ef_search: int = 64):
+        if index not in ("flat", "hnsw"):
+            raise ValueError(f"Unknown index type '{index}'. Expected 'flat' or 'hnsw'.")
+        if index == "hnsw" and faiss is None:
+            raise ImportError("faiss is required for index='hnsw'")
+
+        self.index_type = index
+        self.hnsw_m = hnsw_m
+        self.ef_search = ef_search
+
+        # {session_id: {agent: [metadata]}}
         self.store: Dict[str, Dict[str, List[Dict]]] = {}
-        self.lock = asyncio.Lock()
+        # {session_id: {agent: (capacity, dim) float32 buffer of unit vectors}}.
+        # The first len(self.store[session_id][agent]) rows are live, parallel
+        # to self.store (flat index only)
+        self.matrix: Dict[str, Dict[str, np.ndarray]] = {}
+        # {session_id: {agent: faiss.IndexHNSWFlat}}, ids parallel to self.store
+        # (hnsw index only)
+        self.indexes: Dict[str, Dict[str, Any]] = {}
+        # No lock: nothing below awaits while store, matrix or indexes are
+        # half-updated, so coroutines on the loop always see them consistent
 
         # Bind workspace logger ONCE
         global logger
-        logger = AgentLogger.get_logger(None, component="embedding_store")
+        logger = AgentLogger.get_logger(component="module", module="embedding_store")
 
     async def add_embedding(self, session_id: str, agent: str, embedding: List[float], metadata: Dict[str, Any]):
-        async with self.lock:
-            self.store.setdefault(session_id, {}).setdefault(agent, [])
-            self.store[session_id][agent].append({"vector": np.array(embedding), "metadata": metadata})
-            logger.debug(f"Added embedding for {agent} in session {session_id}")
+        # Normalized once here so search is a plain dot product
+        vector = np.asarray(embedding, dtype=np.float32).reshape(1, -1)
+        vector /= np.linalg.norm(vector) + _EPS
+
+        entries = self.store.setdefault(session_id, {}).setdefault(agent, [])
+        entries.append(metadata)
+
+        if self.index_type == "hnsw":
+            indexes = self.indexes.setdefault(session_id, {})
+            if agent not in indexes:
+                indexes[agent] = self._new_hnsw_index(vector.shape[1])
+            indexes[agent].add(vector)
+        else:
+            matrices = self.matrix.setdefault(session_id, {})
+            row = len(entries) - 1
+            buf = matrices.get(agent)
+            if buf is None:
+                buf = np.empty((_INITIAL_CAPACITY, vector.shape[1]), dtype=np.float32)
+            elif row == buf.shape[0]:
+                # Geometric growth keeps inserts amortized O(1)
+                grown = np.empty((buf.shape[0] * 2, buf.shape[1]), dtype=np.float32)
+                grown[:row] = buf
+                buf = grown
+            buf[row] = vector[0]
+            matrices[agent] = buf
+
+        logger.debug("Added embedding for %s in session %s", agent, session_id)
 
     async def search(self, session_id: str, query_vector: List[float], agent: str = None, top_k: int = 5) -> List[Dict[str, Any]]:
         """
         Returns top_k closest embeddings across all agents if agent=None
         """
-        async with self.lock:
-            results = []
-            query_vec = np.array(query_vector).reshape(1, -1)
-            agents_to_search = [agent] if agent else list(self.store.get(session_id, {}).keys())
-            for a in agents_to_search:
-                for entry in self.store.get(session_id, {}).get(a, []):
-                    score = cosine_similarity(query_vec, entry["vector"].reshape(1, -1))[0][0]
-                    results.append({"agent": a, "metadata": entry["metadata"], "score": score})
-            # Sort by score descending
-            results.sort(key=lambda x: x["score"], reverse=True)
-            return results[:top_k]
+        query = np.asarray(query_vector, dtype=np.float32)
+        query = query / (np.linalg.norm(query) + _EPS)
+
+        entries = self.store.get(session_id, {})
+        agents_to_search = [a for a in ([agent] if agent else entries) if a in entries]
+        if not agents_to_search:
+            return []
+
+        # Metadata lists are append-only, so rows below the snapshot
+        # length stay valid while the scan runs in a worker thread
+        metadata = [entries[a] for a in agents_to_search]
 
+        if self.index_type == "hnsw":
+            # faiss indexes are mutated in place by add(), so query them
+            # on the loop, where no add can interleave
+            scans = [self._search_hnsw(session_id, a, query, top_k) for a in agents_to_search]
+        else:
+            # Views over the live rows only. Buffers are written past the
+            # live rows and copied (not resized) on growth, so these views
+            # are never mutated underneath us.
+            matrices = self.matrix[session_id]
+            views = [matrices[a][:len(entries[a])] for a in agents_to_search]
 
+        if self.index_type != "hnsw":
+            if sum(view.shape[0] for view in views) >= _OFFLOAD_ROWS:
+                # Large scans run in a worker thread; BLAS releases the GIL
+                scans = await asyncio.to_thread(_score_views, views, query)
+            else:
+                scans = _score_views(views, query)
+
+        scores = np.concatenate([s for s, _ in scans])
+        offsets = np.cumsum([s.shape[0] for s, _ in scans])
+
+        results = []
+        for idx in _top_k_indices(scores, top_k):
+            owner = int(np.searchsorted(offsets, idx, side="right"))
+            row = scans[owner][1][idx - (offsets[owner - 1] if owner else 0)]
+            results.append({
+                "agent": agents_to_search[owner],
+                "metadata": metadata[owner][row],
+                "score": float(scores[idx]),
+            })
+        return results
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+
+    def _new_hnsw_index(self, dim: int):
+        # Inner product over unit vectors == cosine similarity
+        index = faiss.IndexHNSWFlat(dim, self.hnsw_m, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efSearch = self.ef_search
+        return index
+
+    def _search_hnsw(self, session_id: str, agent: str, query: np.ndarray, top_k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Candidate (scores, row ids) for one agent from its HNSW index.
+        """
+        distances, ids = self.indexes[session_id][agent].search(query.reshape(1, -1), top_k)
+        found = ids[0] >= 0  # faiss pads with -1 when fewer than top_k exist
+        return distances[0][found], ids[0][found]
@@ -1,17 +1,27 @@
+import threading
+import time
 from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
 from graph.stage_graph import StageGraph
 
 from runtime.agent_registry import AgentRegistry
 from runtime.stage_registry import StageRegistry
 from runtime.workspace_loader import WorkspaceLoader
+from runtime.bootstrap.config_loader import ConfigLoader
 
 from runtime.logger import AgentLogger
 logger = AgentLogger.get_logger(  component="system")
 
+# get() re-checks the config files at most this often
+_CONFIG_CHECK_SECONDS = 1.0
+
 class GraphManager:
     """
     Maintains compiled LangGraph graphs per workspace.
     Handles caching and invalidation for reloads.
+
+    Graphs are cached per (workspace_name, config hash), so a config change
+    picks up a fresh graph while an unchanged config reuses the compiled one.
     """
 
     def __init__(
@@ -19,15 +29,22 @@ class GraphManager:
         workspace_path: Path,
         agent_registry: AgentRegistry,
         stage_registry: StageRegistry,
-        hitl_callback: Optional[Any] = None
+        hitl_callback: Optional[Any] = None,
+        config_loader: Optional[ConfigLoader] = None
     ):
         self.workspace_path = workspace_path
         self.workspace_name = workspace_path.name
         self.agent_registry = agent_registry
         self.stage_registry = stage_registry
         self.hitl_callback = hitl_callback
+        self.config_loader = config_loader
 
-        self._graphs = {}
+        self._graphs: Dict[Tuple[str, str], Any] = {}
+        # Last config hash seen, and when (time.monotonic) it was checked
+        self._hash: str = ""
+        self._hash_checked_at: Optional[float] = None
+        # One lock per workspace so concurrent first requests compile once
+        self._build_locks: Dict[str, threading.Lock] = {}
 
     # ------------------------------------------------------------------
     # Build / Fetch
@@ -36,12 +53,23 @@ class GraphManager:
     def build(self):
         """
         Build and compile the workspace graph dynamically using StageGraph.
-        Caches the compiled graph per workspace.
+        Caches the compiled graph per workspace and config hash.
         """
-        if self.workspace_name in self._graphs:
+        key = (self.workspace_name, self._config_hash())
+        graph = self._graphs.get(key)
+        if graph is not None:
             logger.info(f"Returning cached graph for workspace: {self.workspace_name}")
-            return self._graphs[self.workspace_name]
+            return graph
+
+        lock = self._build_locks.setdefault(self.workspace_name, threading.Lock())
+        with lock:
+            # Another caller may have compiled it while we waited
+            graph = self._graphs.get(key)
+            if graph is not None:
+                return graph
+            return self._compile(key)
 
+    def _compile(self, key: Tuple[str, str]):
         # Build graph dynamically from agent registry and stage router
         logger.info("We are about to enter graph building, plus graph compilation.")
         graph = StageGraph(
@@ -51,8 +79,11 @@ class GraphManager:
             hitl_callback=self.hitl_callback
         ).compile()
 
-        # Cache the compiled graph
-        self._graphs[self.workspace_name] = graph
+        # Cache the compiled graph; graphs for this workspace's older
+        # configs are never asked for again
+        for stale in [k for k in self._graphs if k[0] == key[0] and k != key]:
+            del self._graphs[stale]
+        self._graphs[key] = graph
         logger.info(f"Graph compiled and cached for workspace '{self.workspace_name}'")
 
         return graph
@@ -62,9 +93,31 @@ class GraphManager:
     # ------------------------------------------------------------------
 
     def get(self, workspace_name: str):
-        return self._graphs[workspace_name]
+        graph = self._graphs.get((workspace_name, self._config_hash()))
+        if graph is None and workspace_name == self.workspace_name:
+            # Config changed (or graph invalidated) since the last build
+            return self.build()
+        if graph is None:
+            raise KeyError(workspace_name)
+        return graph
 
     def invalidate(self, workspace_name: str):
-        if workspace_name in self._graphs:
-            del self._graphs[workspace_name]
+        with self._build_locks.setdefault(workspace_name, threading.Lock()):
+            stale = [key for key in list(self._graphs) if key[0] == workspace_name]
+            for key in stale:
+                del self._graphs[key]
+            # Re-read the config on the next get()
+            self._hash_checked_at = None
+        if stale:
             logger.info(f"Invalidated cached graph for workspace: {workspace_name}")
+
+    def _config_hash(self) -> str:
+        if self.config_loader is None:
+            return ""
+        now = time.monotonic()
+        if self._hash_checked_at is None or now - self._hash_checked_at >= _CONFIG_CHECK_SECONDS:
+            # load() only re-parses files whose mtime/size changed
+            self.config_loader.load()
+            self._hash = self.config_loader.get_hash()
+            self._hash_checked_at = now
+        return self._hash
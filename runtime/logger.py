@@ -17,20 +17,56 @@
 
 from __future__ import annotations
 
+import atexit
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from typing import Dict, Optional
 
 from runtime.bootstrap.config_loader import ConfigLoader
 
 
+class _RoutingHandler(logging.Handler):
+    """
+    Dispatches records drained by the QueueListener to the file handler
+    registered for the originating logger.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.routes: Dict[str, logging.Handler] = {}
+
+    def emit(self, record: logging.LogRecord) -> None:
+        handler = self.routes.get(record.name)
+        if handler is not None:
+            handler.handle(record)
+
+
+class _RawQueueHandler(QueueHandler):
+    """
+    Enqueues records as logged. The stock prepare() merges msg and args
+    and formats the traceback on the caller's thread; here that is left
+    to the file handler on the listener thread.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
 class AgentLogger:
     """
     Global static logger.
+
+    Loggers only enqueue records; formatting and file I/O happen on a
+    single background QueueListener thread.
     """
 
     _initialized: bool = False
     _loggers: Dict[str, logging.Logger] = {}
+    _queue: queue.SimpleQueue | None = None
+    _router: _RoutingHandler | None = None
+    _listener: QueueListener | None = None
     _base_dir: Path | None = None
     _level: int = logging.INFO
 
@@ -63,6 +99,13 @@ class AgentLogger:
         cls._level = cls._parse_log_level(level_str)
 
         logging.basicConfig(level=cls._level)
+
+        cls._queue = queue.SimpleQueue()
+        cls._router = _RoutingHandler()
+        cls._listener = QueueListener(cls._queue, cls._router)
+        cls._listener.start()
+        atexit.register(cls._listener.stop)
+
         cls._initialized = True
 
     # ------------------------------------------------------------------
@@ -80,6 +123,16 @@ class AgentLogger:
           - "system"
           - "runtime" (requires workspace)
         """
+        # Fast path: one dict lookup for an already-configured logger
+        if component == "module":
+            key = f"{component}:{module}"
+        else:
+            key = f"{component}:{workspace or 'global'}"
+
+        logger = cls._loggers.get(key)
+        if logger is not None:
+            return logger
+
         if not cls._initialized:
             cls.initialize()
 
@@ -92,15 +145,7 @@ class AgentLogger:
         if component == "module" and not module:
             raise ValueError("Module name is required when component='module'")
 
-        if component == "module":
-            key = f"{component}:{module}"
-            log_path = cls._resolve_log_path(component, module=module)
-        else:
-            key = f"{component}:{workspace or 'global'}"
-            log_path = cls._resolve_log_path(component, workspace=workspace)
-
-        if key in cls._loggers:
-            return cls._loggers[key]
+        log_path = cls._resolve_log_path(component, workspace=workspace, module=module)
 
         logger = logging.getLogger(key)
         logger.setLevel(cls._level)
@@ -108,13 +153,16 @@ class AgentLogger:
 
         log_path.parent.mkdir(parents=True, exist_ok=True)
 
-        handler = logging.FileHandler(log_path)
+        # Formatting happens on the listener thread (see _RawQueueHandler)
+        file_handler = logging.FileHandler(log_path)
         formatter = logging.Formatter(
             "%(asctime)s | %(levelname)-7s | %(name)s | "
             "%(module)s:%(lineno)d | %(funcName)s | %(message)s"
         )
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
+        file_handler.setFormatter(formatter)
+        cls._router.routes[key] = file_handler
+
+        logger.addHandler(_RawQueueHandler(cls._queue))
 
         cls._loggers[key] = logger
         return logger
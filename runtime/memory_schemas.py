@@ -0,0 +1,25 @@
+# runtime/memory_schemas.py
+#
+# The memory schemas are defined once, in llm.memory_schemas. Modules that
+# still import them from runtime get the same class objects, so adapters and
+# MemoryManager never see two diverging EpisodicMemory / SemanticMemory types.
+
+from llm.memory_schemas import (
+    BaseModel,
+    GenericMemory,
+    ProposalMemory,
+    CritiqueMemory,
+    SynthesizerMemory,
+    SemanticMemory,
+    EpisodicMemory,
+)
+
+__all__ = [
+    "BaseModel",
+    "GenericMemory",
+    "ProposalMemory",
+    "CritiqueMemory",
+    "SynthesizerMemory",
+    "SemanticMemory",
+    "EpisodicMemory",
+]
@@ -19,13 +19,9 @@ class LangmemAdapter:
 
     async def store_memory(self, memory: BaseModel) -> str:
         """
-        Stores a memory object in Redis. Returns the generated key.
+        Stores a memory object in LangMem. Returns the key LangMem assigned.
         """
-        key = str(uuid4())
-        langmem_key = self._key(memory.session_id, key)
-
-        await self.manager.add(memory.model_dump_json() )
-        return langmem_key
+        return await self.manager.add(memory.model_dump_json())
 
     async def fetch_memory(
         self,
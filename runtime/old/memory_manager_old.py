@@ -1,12 +1,15 @@
 from __future__ import annotations
-import asyncio
 from typing import Any, Dict, List, Optional
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 from pydantic import BaseModel
 from runtime.memory_adapters.base import MemoryAdapter
 from runtime.logger import AgentLogger
 
 
+# Entries kept by the fetch_semantic result cache
+_SEMANTIC_CACHE_SIZE = 1024
+
+
 class MemoryManager:
     """
     Handles episodic and semantic memory per session and agent.
@@ -23,7 +26,8 @@ class MemoryManager:
         # {session_id: {agent: [memory]}}
         self.semantic_memory: Dict[str, Dict[str, List[Dict]]] = defaultdict(lambda: defaultdict(list))
         self.episodic_memory: Dict[str, Dict[str, List[Dict]]] = defaultdict(lambda: defaultdict(list))
-        self.lock = asyncio.Lock()
+        # LRU of fetch_semantic results, keyed by the full request
+        self._sem_cache: "OrderedDict[tuple, List[Dict]]" = OrderedDict()
 
 
         # Bind workspace logger ONCE
@@ -36,42 +40,59 @@ class MemoryManager:
     # Semantic Memory
     # ------------------------------
     async def store_semantic(self, session_id: str, agent: str, memory: Dict[str, Any]):
-        async with self.lock:
-            self.semantic_memory[session_id][agent].append(memory)
-            logger.debug(f"Stored semantic memory for {agent} in session {session_id}")
+        self.semantic_memory[session_id][agent].append(memory)
+        self.invalidate(session_id)
+        logger.debug(f"Stored semantic memory for {agent} in session {session_id}")
 
     async def fetch_semantic(
         self, session_id: str, task: str, agent: Optional[str] = None, top_k: int = 5, filters: Optional[Dict] = None
     ) -> List[Dict]:
-        async with self.lock:
-            agent_memories = (
-                self.semantic_memory[session_id][agent] if agent else [m for a in self.semantic_memory[session_id].values() for m in a]
-            )
-            # Apply filters
-            if filters:
-                agent_memories = [m for m in agent_memories if all(m.get(k) == v for k, v in filters.items())]
-            return agent_memories[-top_k:]
+        try:
+            key = (session_id, agent, task, top_k, frozenset((filters or {}).items()))
+        except TypeError:
+            # Unhashable filter values; don't cache
+            key = None
+        if key is not None and key in self._sem_cache:
+            self._sem_cache.move_to_end(key)
+            return list(self._sem_cache[key])
+
+        agent_memories = (
+            self.semantic_memory[session_id][agent] if agent else [m for a in self.semantic_memory[session_id].values() for m in a]
+        )
+        # Apply filters
+        if filters:
+            agent_memories = [m for m in agent_memories if all(m.get(k) == v for k, v in filters.items())]
+        result = agent_memories[-top_k:]
+
+        if key is not None:
+            self._sem_cache[key] = result
+            if len(self._sem_cache) > _SEMANTIC_CACHE_SIZE:
+                self._sem_cache.popitem(last=False)
+        return list(result)
+
+    def invalidate(self, session_id: str):
+        """Drop cached fetch_semantic results for a session."""
+        for key in [k for k in self._sem_cache if k[0] == session_id]:
+            del self._sem_cache[key]
 
     # ------------------------------
     # Episodic Memory
     # ------------------------------
     async def store_episodic(self, session_id: str, agent: str, stage: str, memory: Dict[str, Any]):
-        async with self.lock:
-            mem = memory.copy()
-            mem["stage"] = stage
-            self.episodic_memory[session_id][agent].append(mem)
-            logger.debug(f"Stored episodic memory for {agent} at stage {stage} in session {session_id}")
+        mem = memory.copy()
+        mem["stage"] = stage
+        self.episodic_memory[session_id][agent].append(mem)
+        logger.debug(f"Stored episodic memory for {agent} at stage {stage} in session {session_id}")
 
     async def fetch_episodic(
         self, session_id: str, agent: str, stage: Optional[str] = None, top_k: int = 3, filters: Optional[Dict] = None
     ) -> List[Dict]:
-        async with self.lock:
-            mems = self.episodic_memory[session_id].get(agent, [])
-            if stage:
-                mems = [m for m in mems if m.get("stage") == stage]
-            if filters:
-                mems = [m for m in mems if all(m.get(k) == v for k, v in filters.items())]
-            return mems[-top_k:]
+        mems = self.episodic_memory[session_id].get(agent, [])
+        if stage:
+            mems = [m for m in mems if m.get("stage") == stage]
+        if filters:
+            mems = [m for m in mems if all(m.get(k) == v for k, v in filters.items())]
+        return mems[-top_k:]
 
     # ------------------------------
     # Generic Store
@@ -1,6 +1,6 @@
 
 import asyncio
-import json
+import orjson
 from typing import Any, Dict, List, Optional, Union
 from uuid import uuid4
 import redis.asyncio as aioredis
@@ -52,7 +52,7 @@ class RedisMemoryAdapter:
             raw = await self.redis.get(key)
             if not raw:
                 continue
-            memory = json.loads(raw)
+            memory = orjson.loads(raw)
 
             # ---- Session Filter
             if session_id and memory.get("session_id") != session_id:
@@ -30,6 +30,12 @@ from runtime.stage_registry import StageRegistry
 from runtime.graph_manager import GraphManager
 from runtime.logger import AgentLogger
 
+# graph_events queued for delivery before the graph stream waits on them
+_MAX_PENDING_EMITS = 32
+
+# Ends the graph_event queue
+_END_OF_STREAM = object()
+
 class Orchestrator:
     """
     Per-session orchestrator that manages execution of a LangGraph graph
@@ -88,15 +94,51 @@ class Orchestrator:
                 },
             )
 
-        async for event in self.graph.astream(session_state):
-
-            logger.info("We are inside graph.astream - an event is emitted ...")
-            logger.info(event)
-
-            logger.info("Emitting graph_event ...")
-
-            await self.event_bus.emit("graph_event", event)
-            logger.info("Now waiting for graph_event response")
+        # Subscribers run while the graph moves on to its next node. One
+        # consumer delivers graph_events in order; the stream only waits once
+        # _MAX_PENDING_EMITS are queued
+        queue: asyncio.Queue = asyncio.Queue(_MAX_PENDING_EMITS)
+
+        async def _drain():
+            while (event := await queue.get()) is not _END_OF_STREAM:
+                await self.event_bus.emit("graph_event", event)
+
+        drainer = asyncio.create_task(_drain())
+        running = asyncio.current_task()
+
+        def _on_drained(task: asyncio.Task):
+            # A subscriber raised: stop the graph at the event that caused it
+            if not task.cancelled() and task.exception() is not None:
+                running.cancel()
+
+        drainer.add_done_callback(_on_drained)
+
+        try:
+            async for event in self.graph.astream(session_state):
+
+                logger.info("We are inside graph.astream - an event is emitted ...")
+                logger.info(event)
+
+                logger.info("Emitting graph_event ...")
+
+                await queue.put(event)
+
+            # Every graph_event is delivered before orchestrator_end
+            await queue.put(_END_OF_STREAM)
+            await drainer
+        except asyncio.CancelledError:
+            if drainer.done() and not drainer.cancelled() and drainer.exception() is not None:
+                # The cancel came from _on_drained, not from our caller
+                running.uncancel()
+                raise drainer.exception() from None
+            raise
+        except Exception:
+            # Events from before the graph failed are still delivered
+            await queue.put(_END_OF_STREAM)
+            await drainer
+            raise
+        finally:
+            drainer.cancel()
 
         logger.info("Exited from graph.astream")
 
@@ -8,10 +8,43 @@ from runtime.workspace_loader import WorkspaceLoader
 from runtime.graph_manager import GraphManager
 from runtime.logger import AgentLogger
 
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # optional, workspaces are then polled every interval_seconds
+    FileSystemEventHandler = object
+    Observer = None
+
+# Quiet period after a filesystem event before the workspace is re-hashed,
+# so a burst of writes (editor save, git checkout) triggers one reload
+_DEBOUNCE_SECONDS = 0.5
+
+# Event types that can change workspace content. Opened/closed events are
+# left out: our own re-hash and reload read every file and would retrigger
+_CHANGE_EVENTS = frozenset({"created", "modified", "deleted", "moved"})
+
+
+class _WorkspaceEventHandler(FileSystemEventHandler):
+    """Runs notify on the event loop for every event under a workspace."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, notify):
+        self._loop = loop
+        self._notify = notify
+
+    def on_any_event(self, event):
+        # Called on the observer thread
+        if event.event_type in _CHANGE_EVENTS:
+            self._loop.call_soon_threadsafe(self._notify)
+
+
 class ReloadManager:
     """
     Watches for workspace artifact changes and reloads dynamically.
     Supports single or multi-workspace setups.
+
+    With watchdog installed, reloads are driven by filesystem events
+    (inotify / FSEvents / ReadDirectoryChangesW); otherwise, or with
+    use_watchdog=False, each workspace is re-hashed every interval_seconds.
     """
 
     def __init__(
@@ -19,17 +52,23 @@ class ReloadManager:
         workspace_loaders: Dict[str, WorkspaceLoader],
         graph_manager: GraphManager,
         interval_seconds: int = 30,
+        use_watchdog: bool = True,
     ):
         """
         Args:
             workspace_loaders: dict of workspace_name -> WorkspaceLoader
             graph_manager: GraphManager instance for invalidation
             interval_seconds: polling interval for reload check
+            use_watchdog: react to filesystem events instead of polling
+                (ignored when watchdog is not installed)
         """
         self.workspace_loaders = workspace_loaders
         self.graph_manager = graph_manager
         self.interval_seconds = interval_seconds
+        self.use_watchdog = use_watchdog and Observer is not None
         self._tasks: Dict[str, asyncio.Task] = {}
+        self._changed: Dict[str, asyncio.Event] = {}
+        self._observer = None
         self._running = False
 
         # Initialize loggers per workspace
@@ -46,20 +85,43 @@ class ReloadManager:
     # ------------------------------------------------------------------
 
     def start_periodic_reload(self):
-        """Starts periodic monitoring of workspace artifacts."""
+        """Starts monitoring of workspace artifacts."""
         if self._running:
             return
         self._running = True
-        for ws_name in self.workspace_loaders.keys():
-            task = asyncio.create_task(self._watch_workspace(ws_name))
-            self._tasks[ws_name] = task
+
+        loop = asyncio.get_running_loop()
+        for ws_name, loader in self.workspace_loaders.items():
+            workspace_path = getattr(loader, "workspace_path", None)
+            if not self.use_watchdog or workspace_path is None:
+                # No directory to watch: poll, which logs the loader's errors
+                self._tasks[ws_name] = asyncio.create_task(self._watch_workspace(ws_name))
+                continue
+
+            if self._observer is None:
+                self._observer = Observer()
+            changed = self._changed[ws_name] = asyncio.Event()
+            self._observer.schedule(
+                _WorkspaceEventHandler(loop, changed.set),
+                str(workspace_path),
+                recursive=True,
+            )
+            self._tasks[ws_name] = asyncio.create_task(self._watch_events(ws_name))
+
+        if self._observer is not None:
+            self._observer.start()
 
     def stop_periodic_reload(self):
         """Stops monitoring and cancels all tasks."""
         self._running = False
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join(timeout=1)
+            self._observer = None
         for task in self._tasks.values():
             task.cancel()
         self._tasks.clear()
+        self._changed.clear()
 
     # -------------------------------------------------------------------------
     # Internal watchers
@@ -86,11 +148,39 @@ class ReloadManager:
             except Exception as e:
                 logger.error(f"Error while watching workspace '{ws_name}': {e}")
 
+    async def _watch_events(self, ws_name: str):
+        """Reloads a single workspace after its filesystem events settle."""
+        loader = self.workspace_loaders[ws_name]
+        logger = self.loggers[ws_name]
+        changed = self._changed[ws_name]
+
+        while self._running:
+            try:
+                await changed.wait()
+                # Debounce: keep waiting while events are still arriving
+                while True:
+                    changed.clear()
+                    await asyncio.sleep(_DEBOUNCE_SECONDS)
+                    if not changed.is_set():
+                        break
+                # Events also fire for writes that leave the content as it
+                # was; the hash filters those out
+                new_hash = loader._compute_version_hash()
+                if loader.version_hash != new_hash:
+                    logger.info(f"Detected changes in workspace '{ws_name}', reloading...")
+                    await self._reload_workspace(ws_name, loader)
+                    loader.version_hash = new_hash
+            except asyncio.CancelledError:
+                logger.info(f"Stopping workspace watcher for '{ws_name}'")
+                break
+            except Exception as e:
+                logger.error(f"Error while watching workspace '{ws_name}': {e}")
+
     async def _reload_workspace(self, ws_name: str, loader: WorkspaceLoader):
         """Performs the actual reload of a workspace and invalidates the graph."""
         logger = self.loggers[ws_name]
         try:
-            await loader.load()
+            loader.load_workspace()
             logger.info(f"Workspace '{ws_name}' reloaded successfully.")
             self.graph_manager.invalidate(ws_name)
             logger.info(f"Graph invalidated for workspace '{ws_name}'.")
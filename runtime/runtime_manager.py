@@ -10,6 +10,7 @@ from runtime.workspace_loader import WorkspaceLoader
 from runtime.agent_registry import AgentRegistry
 from runtime.stage_registry import StageRegistry
 from runtime.graph_manager import GraphManager
+from runtime.bootstrap.config_loader import ConfigLoader
 from runtime.reload_manager import ReloadManager
 from runtime.orchestrator import Orchestrator
 from runtime.session_manager import SessionManager
@@ -76,7 +77,8 @@ class RuntimeManager:
 
         # ---- Singletons (loaded once per workspace) ----
         # Load Workspace Configuration (workspace.json)
-        self.workspace_meta = WorkspaceLoader(workspace_path).load_workspace()
+        self.workspace_loader = WorkspaceLoader(workspace_path)
+        self.workspace_meta = self.workspace_loader.load_workspace()
         logger.info(f"Workspace metadata loaded: {self.workspace_meta.get('name')}")
 
         self.agent_registry = AgentRegistry(
@@ -93,12 +95,21 @@ class RuntimeManager:
         logger.info(f"Stages loaded: {self.stage_registry.list_stages()}")
 
         logger.info(f"Initializing runtime graph for workspace '{self.workspace_name}'")
-        self.graph_manager = GraphManager(workspace_path, self.agent_registry, self.stage_registry)
+        self.config_loader = ConfigLoader(
+            global_config_path=Path(__file__).parent / "bootstrap" / "config.json",
+            workspaces_root=workspace_path,
+        )
+        self.graph_manager = GraphManager(
+            workspace_path,
+            self.agent_registry,
+            self.stage_registry,
+            config_loader=self.config_loader,
+        )
         self.graph_manager.build()
         logger.info("Execution graph built successfully for '{self.workspace_name}'")
 
         self.reload_manager = ReloadManager(
-            workspace_loaders={self.workspace_name: self.workspace_meta},
+            workspace_loaders={self.workspace_name: self.workspace_loader},
             graph_manager=self.graph_manager,
             interval_seconds=30
         )
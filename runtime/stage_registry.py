@@ -8,14 +8,30 @@ StageRegistry does NOT execute agents or manage state.
 """
 from __future__ import annotations
 import json
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Callable
+from typing import Dict, List, Optional, Any, Callable, Tuple
 from events.event_bus import EventBus
 
 from runtime.logger import AgentLogger
 
 logger = AgentLogger.get_logger(  component="system")
 
+# Only these builtins are visible to exit_condition expressions. Shared by
+# every stage; eval() never writes to a globals dict that has __builtins__
+_SAFE_GLOBALS = {"__builtins__": {"len": len, "any": any, "all": all, "sum": sum, "min": min, "max": max}}
+
+
+# path -> ((st_mtime_ns, st_size), stage metas sorted by priority). Reloads
+# of an unchanged stage.json skip the parse; an edit replaces the entry
+_STAGE_CACHE: Dict[str, Tuple[tuple, List[Dict[str, Any]]]] = {}
+
+
+@lru_cache(maxsize=256)
+def _compile_expr(expr: str):
+    """Code object for an exit_condition; each distinct expression is compiled once."""
+    return compile(expr, "<exit_condition>", "eval")
+
 class Stage:
     def __init__(self, meta: Dict[str, Any], workspace_name: str, exit_condition: Optional[Callable[[Dict[str, Any]], bool]] = None):
         self.name: str = meta["name"]
@@ -35,14 +51,13 @@ class Stage:
         assert callable(self.exit_condition), "exit_condition must be callable"
 
     def _compile_exit_condition(self, expr: str) -> Callable[[dict], bool]:
-        safe_globals = {"__builtins__": {"len": len, "any": any, "all": all, "sum": sum, "min": min, "max": max}}
         try:
-            code = compile(expr, "<exit_condition>", "eval")
+            code = _compile_expr(expr)
         except SyntaxError as e:
             raise ValueError(f"Invalid exit_condition for stage '{self.name}': {expr}") from e
 
         def _exit_fn(state: dict) -> bool:
-            return bool(eval(code, safe_globals, {"state": state}))
+            return bool(eval(code, _SAFE_GLOBALS, {"state": state}))
 
         return _exit_fn
 
@@ -67,6 +82,10 @@ class StageRegistry:
 
         self._stages: Dict[str, Stage] = {}
         self._order: List[str] = []
+        # Built at load so the per-transition accessors are one dict lookup
+        self._next_of: Dict[str, Optional[str]] = {}
+        self._allowed_agents_of: Dict[str, List[str]] = {}
+        self._terminal_of: Dict[str, bool] = {}
 
     def load_stages(self):
         stage_path = Path(self.workspace_dir / self.stage_file)
@@ -74,22 +93,33 @@ class StageRegistry:
             logger.error(f"Stage file not found: {stage_path}")
             raise FileNotFoundError(f"Stage file not found: {stage_path}")
 
-        with stage_path.open("r", encoding="utf-8") as f:
-            data = json.load(f)
+        st = stage_path.stat()
+        stamp = (st.st_mtime_ns, st.st_size)
+        cached = _STAGE_CACHE.get(str(stage_path))
+        if cached is not None and cached[0] == stamp:
+            sorted_stages = cached[1]
+        else:
+            with stage_path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+
+            # Sort by priority
+            sorted_stages = sorted(data.get("stages", []), key=lambda s: s.get("priority", 1))
+            _STAGE_CACHE[str(stage_path)] = (stamp, sorted_stages)
 
-        stages_meta = data.get("stages", [])
-        if not stages_meta:
+        if not sorted_stages:
             logger.warning("No stages defined in stage.json")
             return
 
-        # Sort by priority
-        sorted_stages = sorted(stages_meta, key=lambda s: s.get("priority", 1))
         for stage_meta in sorted_stages:
             stage = Stage(stage_meta, self.workspace_name)
             self._stages[stage.name] = stage
             self._order.append(stage.name)
             logger.info(f"Registered stage '{stage.name}' with allowed_agents={stage.allowed_agents}")
 
+        self._next_of = dict(zip(self._order, self._order[1:] + [None]))
+        self._allowed_agents_of = {name: stage.allowed_agents for name, stage in self._stages.items()}
+        self._terminal_of = {name: stage.terminal for name, stage in self._stages.items()}
+
     # -----------------------------
     # Accessors
     # -----------------------------
@@ -105,18 +135,14 @@ class StageRegistry:
         return self._order[0]
 
     def next_stage(self, current_stage: str) -> Optional[str]:
-        if current_stage not in self._order:
+        try:
+            return self._next_of[current_stage]
+        except KeyError:
             logger.warning(f"Current stage '{current_stage}' not found in stage order")
             return None
-        idx = self._order.index(current_stage)
-        if idx + 1 < len(self._order):
-            return self._order[idx + 1]
-        return None
 
     def allowed_agents(self, stage_name: str) -> List[str]:
-        stage = self.get(stage_name)
-        return stage.allowed_agents if stage else []
+        return self._allowed_agents_of.get(stage_name, [])
 
     def is_terminal(self, stage_name: str) -> bool:
-        stage = self.get(stage_name)
-        return stage.terminal if stage else False
+        return self._terminal_of.get(stage_name, False)
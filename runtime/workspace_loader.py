@@ -2,7 +2,9 @@
 
 import json
 import hashlib
+import os
 from pathlib import Path
+from typing import Any, Dict, Tuple
 from agents.skills.agent import SkillAgent
 from runtime.agent_registry import AgentRegistry
 from runtime.stage_registry import StageRegistry
@@ -22,6 +24,8 @@ class WorkspaceLoader:
         self.workspace_name = workspace_path.name
         
         self.version_hash = None
+        # relpath -> (st_mtime_ns, st_size, sha256 digest) from the last hash
+        self._file_digests: Dict[str, Tuple[int, int, bytes]] = {}
 
     # --------------------------------------------------
     # Load workspace.json configuration
@@ -61,9 +65,37 @@ class WorkspaceLoader:
             raise ValueError(f"Invalid JSON in {path}: {e}") from e
 
     def _compute_version_hash(self):
+        """
+        sha256 over (relpath, file digest) pairs. Files whose mtime and size
+        are unchanged since the last call reuse their digest, so a quiet
+        workspace costs one stat per file and no reads.
+        """
+        digests: Dict[str, Tuple[int, int, bytes]] = {}
+        root = str(self.workspace_path)
+        stack = [root]
+        while stack:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                        continue
+                    if not entry.is_file():
+                        continue
+                    st = entry.stat()
+                    rel = os.path.relpath(entry.path, root)
+                    cached = self._file_digests.get(rel)
+                    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+                        digests[rel] = cached
+                        continue
+                    with open(entry.path, "rb") as f:
+                        digest = hashlib.file_digest(f, "sha256").digest()
+                    digests[rel] = (st.st_mtime_ns, st.st_size, digest)
+
+        # Rebuilt each call, so deleted files drop out
+        self._file_digests = digests
         h = hashlib.sha256()
-        for file in sorted(self.workspace_path.rglob("*")):
-            if file.is_file():
-                h.update(file.read_bytes())
+        for rel in sorted(digests):
+            h.update(rel.encode())
+            h.update(digests[rel][2])
         return h.hexdigest()
 
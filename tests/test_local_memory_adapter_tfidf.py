@@ -0,0 +1,67 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from llm.old.memory_adapters_old import local_memory_adapter_tfidf as tfidf
+from runtime.memory_schemas import GenericMemory
+
+
+class _Adapter(tfidf.LocalMemoryAdapter):
+    # Semantic methods are not under test
+    async def add_embeddings(self, *args, **kwargs):
+        return None
+
+    async def semantic_search(self, *args, **kwargs):
+        return []
+
+    async def query(self, *args, **kwargs):
+        return []
+
+
+def _store(adapter, n, start=0):
+    async def _run():
+        for i in range(start, start + n):
+            await adapter.store_memory(GenericMemory(data={"i": i}))
+    asyncio.run(_run())
+
+
+def _ids(adapter):
+    return [m["data"]["i"] for m in adapter._memory]
+
+
+def test_crash_between_snapshot_and_log_unlink(tmp_path, monkeypatch):
+    persist = tmp_path / "memory.json"
+    adapter = _Adapter("ws", persist_path=persist)
+    _store(adapter, 3)
+
+    # Crash right after the snapshot replaced the old one: the log survives
+    real_unlink = Path.unlink
+
+    def crash(self, *args, **kwargs):
+        if self == adapter._log_path:
+            raise SystemExit("crash")
+        return real_unlink(self, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "unlink", crash)
+    with pytest.raises(SystemExit):
+        adapter._save_to_disk()
+    monkeypatch.setattr(Path, "unlink", real_unlink)
+    assert persist.exists() and adapter._log_path.exists()
+
+    reloaded = _Adapter("ws", persist_path=persist)
+    assert _ids(reloaded) == [0, 1, 2]
+
+    # Inserts after the restart go to a fresh log and survive the next one
+    _store(reloaded, 2, start=3)
+    assert _ids(_Adapter("ws", persist_path=persist)) == [0, 1, 2, 3, 4]
+
+
+def test_log_replayed_on_top_of_snapshot(tmp_path):
+    persist = tmp_path / "memory.json"
+    adapter = _Adapter("ws", persist_path=persist)
+    _store(adapter, 2)
+    adapter._save_to_disk()
+    _store(adapter, 2, start=2)
+
+    assert _ids(_Adapter("ws", persist_path=persist)) == [0, 1, 2, 3]